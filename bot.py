@@ -3,7 +3,7 @@ import logging
 import os
 import re
 from aiogram import Bot, Dispatcher, types, F
-from aiogram.filters import CommandStart, Command
+from aiogram.filters import CommandStart, Command, CommandObject
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
@@ -16,6 +16,12 @@ load_dotenv()
 # Получаем токен бота из переменной окружения
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 QWEN_API_KEY = os.getenv("QWEN_API_KEY")
+# Telegram id администраторов через запятую (доступ к /stats)
+ADMIN_IDS = {
+    int(admin_id)
+    for admin_id in os.getenv("ADMIN_IDS", "").split(",")
+    if admin_id.strip().isdigit()
+}
 
 # Проверяем, задан ли токен
 if not BOT_TOKEN:
@@ -36,22 +42,33 @@ qwen_client = AsyncOpenAI(
 # Импортируем модули проекта
 from database import (
     init_db,
+    close_db,
     save_user,
     update_user_data,
     subscribe_user,
     unsubscribe_user,
     get_user_data,
+    get_birth_statistics,
+    audit_astro_columns,
+)
+from zodiac import get_zodiac_sign_for_date, calculate_life_number
+from horoscope_api import (
+    get_horoscope_message,
+    get_natal_chart_info,
+    get_http_session,
+    close_http_session,
+    shutdown_parse_pool,
 )
-from zodiac import get_zodiac_sign
-from horoscope_api import get_daily_horoscope, get_natal_chart_info
 from scheduler import scheduler
+from fsm_storage import SQLiteStorage
 
 # Настраиваем логирование
 logging.basicConfig(level=logging.INFO)
 
 # Создаём экземпляры бота и диспетчера
 bot = Bot(token=BOT_TOKEN)
-dp = Dispatcher()
+# Состояния FSM хранятся в БД, чтобы переживать перезапуск
+dp = Dispatcher(storage=SQLiteStorage())
 
 
 # Определяем состояния для FSM
@@ -103,16 +120,7 @@ def calculate_soul_formula(birth_date_str: str) -> str:
         if not (1 <= day <= 31) or not (1 <= month <= 12) or not (1900 <= year <= 2030):
             return "Некорректная дата."
 
-        # Суммируем все цифры
-        total = day + month + year
-        # Приводим к однозначному числу
-        while total > 9:
-            # Проверка на мастер-числа
-            if total in [11, 22, 33]:
-                break
-            total = sum(int(digit) for digit in str(total))
-
-        return str(total)
+        return str(calculate_life_number(day, month, year))
     except Exception as e:
         logging.error(f"Ошибка при вычислении числа жизни для {birth_date_str}: {e}")
         return "Ошибка при расчёте."
@@ -297,7 +305,8 @@ async def get_birth_date(message: types.Message, state: FSMContext):
             )
             return
 
-        zodiac = get_zodiac_sign(day, month)
+        # Год рождения уточняет знак для родившихся на границе знаков
+        zodiac = get_zodiac_sign_for_date(day, month, year)
 
         # Сохраняем дату рождения и знак зодиака в состоянии
         await state.update_data(birth_date=date_str, zodiac_sign=zodiac)
@@ -468,6 +477,36 @@ async def cmd_help(message: types.Message):
     )
 
 
+# Обработчик команды /stats (только для администраторов)
+@dp.message(Command("stats"))
+async def cmd_stats(message: types.Message, command: CommandObject):
+    """Статистика пользователей и проверка знаков/чисел жизни; "/stats fix" исправляет расхождения"""
+    if message.from_user.id not in ADMIN_IDS:
+        return
+
+    fix = (command.args or "").strip().lower() == "fix"
+    statistics = await get_birth_statistics()
+    audit = await audit_astro_columns(fix=fix)
+
+    lines = [f"📈 Пользователей с датой рождения: {statistics['users']}", "", "♈ Знаки зодиака:"]
+    for sign, count in statistics["signs"].items():
+        lines.append(f"{sign}: {count}")
+    lines.append("")
+    lines.append("🔢 Числа жизни:")
+    for number, count in statistics["life_numbers"].items():
+        lines.append(f"{number}: {count}")
+    lines.append("")
+    lines.append(f"🔍 Проверено записей: {audit['checked']}")
+    lines.append(f"Расхождений в знаке: {audit['sign_mismatches']}")
+    lines.append(f"Расхождений в числе жизни: {audit['life_number_mismatches']}")
+    if fix:
+        lines.append(f"Исправлено: {audit['fixed']}")
+    elif audit["sign_mismatches"] or audit["life_number_mismatches"]:
+        lines.append("Для исправления: /stats fix")
+
+    await message.bot.send_message(chat_id=message.chat.id, text="\n".join(lines))
+
+
 # Обработчик кнопки '🔮 Гороскоп'
 @dp.message(lambda message: message.text == "🔮 Гороскоп")
 async def btn_horoscope(message: types.Message):
@@ -493,19 +532,13 @@ async def btn_horoscope(message: types.Message):
     birth_date_str = user_data_from_db[0]  # Дата рождения (строка)
     zodiac_sign = user_data_from_db[1]  # Знак зодиака (строка)
 
-    # 3. Подготавливаем параметры дня и месяца рождения
-    birth_day_int = None
-    birth_month_int = None
-    if birth_date_str:
-        try:
-            day, month, year = map(int, birth_date_str.split("."))
-            birth_day_int = day
-            birth_month_int = month
-        except (ValueError, IndexError):
-            logging.warning(
-                f"Предупреждение: Не удалось распарсить дату рождения '{birth_date_str}' для пользователя {message.from_user.id}"
-            )
-            # birth_day_int и birth_month_int останутся None
+    # 3. День и месяц рождения уже разобраны и хранятся в БД
+    birth_day_int = user_data_from_db[4]
+    birth_month_int = user_data_from_db[5]
+    if birth_date_str and birth_day_int is None:
+        logging.warning(
+            f"Предупреждение: Не удалось распарсить дату рождения '{birth_date_str}' для пользователя {message.from_user.id}"
+        )
 
     # 4. Отправляем сообщение о загрузке и вызываем функцию гороскопа
     # loading_msg = await message.answer("🔮 Получаю астрологический гороскоп...")
@@ -513,14 +546,13 @@ async def btn_horoscope(message: types.Message):
         chat_id=message.chat.id, text="🔮 Получаю астрологический гороскоп..."
     )
 
-    # 5. Передаем день и месяц рождения в функцию
-    horoscope_data = await get_daily_horoscope(
-        zodiac_sign, birth_day_int, birth_month_int
+    # 5. Готовый текст на сегодня; день и месяц рождения нужны, если прогноз ещё не загружен
+    message_text = await get_horoscope_message(
+        zodiac_sign, birth_day=birth_day_int, birth_month=birth_month_int
     )
 
     await loading_msg.delete()
 
-    message_text = format_real_horoscope_message(horoscope_data)
     await message.bot.send_message(
         chat_id=message.chat.id, text=message_text, reply_markup=get_main_keyboard()
     )
@@ -546,7 +578,7 @@ async def btn_natal_chart(message: types.Message):
         return
 
     # 2. Извлекаем данные
-    birth_date, zodiac_sign, birth_time, birth_place = user_data
+    birth_date, zodiac_sign, birth_time, birth_place = user_data[:4]
 
     # 3. Получаем информацию о натальной карте
     # Теперь get_natal_chart_info возвращает dict с ключами 'info_text' и 'url'
@@ -609,7 +641,7 @@ async def btn_profile(message: types.Message):
         )
         return
 
-    birth_date, zodiac_sign, birth_time, birth_place = user_data
+    birth_date, zodiac_sign, birth_time, birth_place = user_data[:4]
 
     if not birth_date:
         await message.bot.send_message(
@@ -732,11 +764,15 @@ async def btn_soul_formula(message: types.Message):
         )
         return
 
-    # 2. Извлекаем дату рождения
+    # 2. Извлекаем дату рождения и сохранённое число жизни
     birth_date = user_data[0]
+    life_number = user_data[7]
 
-    # 3. Вычисляем формулу души
-    soul_number = calculate_soul_formula(birth_date)
+    # 3. Берём готовое число жизни; расчёт по строке нужен только для некорректных дат
+    if life_number is not None:
+        soul_number = str(life_number)
+    else:
+        soul_number = calculate_soul_formula(birth_date)
 
     # 4. Формируем и отправляем ответ
     # --- Обновляем описания с более подробной информацией ---
@@ -976,16 +1012,11 @@ async def handle_any_other_message(message: types.Message, state: FSMContext):
     #     )
 
 
-# Функция для форматирования реального гороскопа
-def format_real_horoscope_message(data: dict) -> str:
-    """Форматирование реального гороскопа с астрологическими данными"""
-    message = data.get("description", "Гороскоп недоступен.")
-    return message
-
-
 # Основная функция запуска бота
 async def main():
     await init_db()
+    # Открываем общую HTTP-сессию для запросов к внешним сервисам
+    await get_http_session()
 
     # Инициализируем бота для установки команд
     bot_instance = Bot(token=BOT_TOKEN)
@@ -997,7 +1028,13 @@ async def main():
     asyncio.create_task(scheduler(bot_instance))
 
     # Запускаем polling
-    await dp.start_polling(bot_instance)
+    try:
+        await dp.start_polling(bot_instance)
+    finally:
+        # Закрываем общие соединения при остановке
+        await close_http_session()
+        shutdown_parse_pool()
+        await close_db()
 
 
 # Точка входа в программу
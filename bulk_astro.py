@@ -0,0 +1,130 @@
+# bulk_astro.py
+
+# Пакетный расчёт знаков зодиака и чисел жизни для больших выборок
+# (миграции, проверки согласованности, статистика). С NumPy расчёт идёт
+# векторно; без него - тем же табличным способом в цикле.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from zodiac import (
+    ZODIAC_SIGNS,
+    INGRESS_FIRST_YEAR,
+    INGRESS_LAST_YEAR,
+    calculate_life_number,
+    FIXED_SIGN_TABLE,
+    get_year_sign_table,
+)
+
+SIGN_UNKNOWN = -1  # код знака для некорректной даты
+
+_MONTH_LENGTHS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MONTH_STARTS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_MASTER_NUMBERS = (11, 22, 33)
+
+
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _sign_code(day: int, month: int, year: int = None) -> int:
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return SIGN_UNKNOWN
+    if year is None or not INGRESS_FIRST_YEAR <= year <= INGRESS_LAST_YEAR:
+        return FIXED_SIGN_TABLE[(month - 1) * 31 + day - 1]
+    if day > _MONTH_LENGTHS[month - 1] or (month == 2 and day == 29 and not _is_leap(year)):
+        return SIGN_UNKNOWN
+    day_of_year = _MONTH_STARTS[month - 1] + day - 1
+    if month > 2 and _is_leap(year):
+        day_of_year += 1
+    return get_year_sign_table(year)[day_of_year]
+
+
+def sign_codes(days, months, years=None):
+    """
+    Коды знаков зодиака (индексы ZODIAC_SIGNS) для массивов дат рождения.
+    С годами учитываются даты перехода Солнца конкретного года, как в
+    get_zodiac_sign_for_date; без них - усреднённые, как в get_zodiac_sign.
+    Некорректные даты проверяются так же, как в этих функциях: без года (и
+    для лет вне таблиц переходов) допустим любой день 1-31, с годом - только
+    существующая дата; иначе возвращается SIGN_UNKNOWN.
+    Returns:
+        numpy.ndarray (int8) при наличии NumPy, иначе list
+    """
+    if np is None:
+        if years is None:
+            return [_sign_code(d, m) for d, m in zip(days, months)]
+        return [_sign_code(d, m, y) for d, m, y in zip(days, months, years)]
+
+    days = np.asarray(days, dtype=np.int64)
+    months = np.asarray(months, dtype=np.int64)
+    valid = (months >= 1) & (months <= 12) & (days >= 1) & (days <= 31)
+    month_index = np.where(valid, months - 1, 0)
+    day_index = np.where(valid, days - 1, 0)
+
+    fixed_table = np.asarray(FIXED_SIGN_TABLE, dtype=np.int8)
+    codes = fixed_table[month_index * 31 + day_index]
+
+    if years is not None:
+        years = np.asarray(years, dtype=np.int64)
+        leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+        in_range = (years >= INGRESS_FIRST_YEAR) & (years <= INGRESS_LAST_YEAR)
+        # Для лет из таблиц переходов дата должна существовать
+        exists = (days <= np.asarray(_MONTH_LENGTHS)[month_index]) & ~(
+            (months == 2) & (days == 29) & ~leap
+        )
+        valid &= ~in_range | exists
+        in_range &= valid
+        if in_range.any():
+            # Таблицы знаков по дням только для встречающихся лет
+            first_year = int(years[in_range].min())
+            last_year = int(years[in_range].max())
+            year_tables = np.zeros((last_year - first_year + 1, 366), dtype=np.int8)
+            for year in np.unique(years[in_range]).tolist():
+                table = np.frombuffer(get_year_sign_table(year), dtype=np.uint8)
+                year_tables[year - first_year, : len(table)] = table
+            day_of_year = np.where(
+                in_range,
+                np.asarray(_MONTH_STARTS)[month_index] + day_index + (leap & (months > 2)),
+                0,
+            )
+            year_index = np.where(in_range, years - first_year, 0)
+            codes = np.where(in_range, year_tables[year_index, day_of_year], codes)
+
+    return np.where(valid, codes, SIGN_UNKNOWN).astype(np.int8)
+
+
+def _digit_sum(values):
+    total = np.zeros_like(values)
+    while values.any():
+        total += values % 10
+        values = values // 10
+    return total
+
+
+def life_numbers(days, months, years):
+    """
+    Числа жизни для массивов дат рождения, как calculate_life_number.
+    Returns:
+        numpy.ndarray (int64) при наличии NumPy, иначе list
+    """
+    if np is None:
+        return [calculate_life_number(d, m, y) for d, m, y in zip(days, months, years)]
+
+    total = (
+        np.asarray(days, dtype=np.int64)
+        + np.asarray(months, dtype=np.int64)
+        + np.asarray(years, dtype=np.int64)
+    )
+    while True:
+        # Сворачиваем числа больше 9, кроме мастер-чисел
+        reducible = (total > 9) & ~np.isin(total, _MASTER_NUMBERS)
+        if not reducible.any():
+            return total
+        total = np.where(reducible, _digit_sum(total), total)
+
+
+def sign_names(codes) -> list:
+    """Названия знаков по кодам; SIGN_UNKNOWN - "Неизвестно" """
+    return [ZODIAC_SIGNS[code] if code >= 0 else "Неизвестно" for code in codes]
@@ -0,0 +1,82 @@
+# circuit_breaker.py
+
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Запрос не выполнен: внешний сервис помечен как недоступный"""
+
+
+class CircuitBreaker:
+    """
+    Автомат защиты для одного внешнего хоста.
+
+    closed    - запросы идут как обычно, подряд идущие ошибки считаются;
+    open      - после failure_threshold ошибок запросы отклоняются сразу,
+                пока не пройдёт cooldown секунд;
+    half_open - пропускается один пробный запрос: успех закрывает автомат,
+                ошибка снова открывает его на cooldown.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.total_failures = 0
+        self.total_rejected = 0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Можно ли сейчас обращаться к сервису"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.total_rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.total_rejected += 1
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.total_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                print(f"Сервис {self.name} помечен недоступным на {self.cooldown} с")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Пробный запрос прерван без результата (например, отменён)"""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        """Состояние автомата для мониторинга"""
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "retry_in": retry_in,
+        }
@@ -15,10 +15,75 @@ ASTROLOGY_API = "https:// astrology-api.p.rapidapi.com/api/astrology"
 # API для получения информации о планетах
 PLANETS_API = "https://planets-api.vercel.app/api/planets"
 
+# Параметры общего HTTP-пула для запросов к внешним сервисам
+HTTP_POOL_LIMIT = 100  # всего одновременных соединений
+HTTP_POOL_LIMIT_PER_HOST = 10  # соединений на один хост
+HTTP_KEEPALIVE_TIMEOUT = 30  # секунды удержания простаивающего соединения
+HTTP_DNS_CACHE_TTL = 300  # секунды кэширования DNS
+
+# Пул для CPU-нагруженного разбора HTML и проверки текстов
+PARSE_POOL_KIND = "thread"  # "thread" - потоковый разбор кусками, "process" - разбор страницы целиком в отдельном процессе
+PARSE_POOL_SIZE = 2  # число потоков/процессов
+# Секунды на разбор одной страницы (все куски вместе) или одну проверку перевода.
+# В лимит входит и ожидание свободного потока: пул общий с is_good_translation,
+# и при PARSE_POOL_SIZE = 2 операция из очереди может не уложиться, не будучи медленной
+PARSE_TIMEOUT = 5
+
+# Хеджированное получение прогноза: aztro запускается, если Rambler не ответил вовремя
+HEDGED_FETCH_ENABLED = True
+HEDGE_DELAY = 3  # секунды ожидания Rambler до запуска aztro
+FORECAST_DEADLINE = 12  # общий лимит на получение прогноза, затем прогноз по умолчанию
+
+# Автоматы защиты внешних сервисов (по хостам)
+BREAKER_FAILURE_THRESHOLD = 3  # ошибок подряд до отключения хоста
+BREAKER_COOLDOWN = 60  # секунды до пробного запроса к отключённому хосту
+
+# Кэш переводов: в памяти (по суммарной длине текстов) и в БД (по числу записей)
+TRANSLATION_CACHE_MAX_CHARS = 2_000_000
+TRANSLATION_CACHE_MAX_ROWS = 20000
+
+# Гонка переводчиков: запуск со сдвигом, побеждает первый качественный перевод
+TRANSLATION_RACE_ENABLED = True
+TRANSLATION_RACE_STAGGER = 1  # секунды между запусками очередных переводчиков
+TRANSLATION_DEADLINE = 15  # общий лимит на перевод, затем возвращается оригинал
+
+# Максимум рассчитанных натальных карт в памяти (в БД хранятся все)
+NATAL_CHART_CACHE_SIZE = 1000
+
+# Каталог дискового HTTP-кэша (ETag/Last-Modified и тела ответов внешних источников)
+HTTP_CACHE_DIR = "http_cache"
+
+# Максимум прогнозов в памяти (12 знаков с запасом на смену дня)
+HOROSCOPE_CACHE_SIZE = 64
+# Время жизни прогноза по умолчанию (когда источники недоступны), секунды
+DEFAULT_FORECAST_CACHE_TTL = 3600
+
 # Время ежедневной рассылки (час в 24-часовом формате)
 DAILY_TIME_HOUR = 9
 DAILY_TIME_MINUTE = 00
 
+# Предзагрузка прогнозов всех знаков перед рассылкой
+PREWARM_MINUTES_BEFORE = 15  # за сколько минут до рассылки начинать
+PREWARM_CONCURRENCY = 4  # сколько знаков загружать одновременно
+PREWARM_RETRIES = 2  # повторные попытки для знака, получившего прогноз по умолчанию
+PREWARM_RETRY_DELAY = 30  # секунды между попытками
+
+# Отложенная запись пользователей в БД (write-behind)
+WRITE_BEHIND_INTERVAL = 0.5  # секунды между сбросами
+WRITE_BEHIND_MAX_BATCH = 200  # число пользователей, при котором сброс идёт сразу
+
+# Кэш профилей пользователей перед get_user_data
+PROFILE_CACHE_SIZE = 10000  # максимум профилей в памяти
+PROFILE_CACHE_TTL = 600  # секунды жизни записи
+
+# Размер пачки при заполнении новых колонок в миграциях
+MIGRATION_BATCH_SIZE = 1000
+
+# Время жизни незавершённой регистрации в FSM (секунды)
+FSM_SESSION_TTL = 24 * 60 * 60
+# Как часто удалять брошенные сессии FSM (секунды)
+FSM_CLEANUP_INTERVAL = 60 * 60
+
 # Работающие русскоязычные сервисы для натальной карты
 NATAL_CHART_SERVICES = [
     "http://astro.map.ru/",
@@ -1,11 +1,99 @@
 # database.py
 
+import asyncio
+import json
+import time
+from collections import Counter, OrderedDict
 import aiosqlite
+from zodiac import calculate_life_number, ZODIAC_SIGNS
+from bulk_astro import sign_codes, life_numbers, sign_names
+
+try:
+    from config import (
+        WRITE_BEHIND_INTERVAL,
+        WRITE_BEHIND_MAX_BATCH,
+        MIGRATION_BATCH_SIZE,
+        PROFILE_CACHE_SIZE,
+        PROFILE_CACHE_TTL,
+    )
+except ImportError:
+    WRITE_BEHIND_INTERVAL = 0.5
+    WRITE_BEHIND_MAX_BATCH = 200
+    MIGRATION_BATCH_SIZE = 1000
+    PROFILE_CACHE_SIZE = 10000
+    PROFILE_CACHE_TTL = 600
 
 DB_NAME = "users.db"
 
+# Общее соединение с БД: открывается в init_db и переиспользуется всеми запросами
+_db = None
+# Блокировка, чтобы execute и commit разных корутин не перемешивались
+_write_lock = asyncio.Lock()
+
+# Настройки SQLite для долгоживущего соединения
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",  # ~16 МБ кэша страниц
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Отложенная запись (write-behind): изменения пользователей копятся в памяти
+# и сбрасываются в БД одной транзакцией по таймеру или при переполнении
+# tg_id -> {"insert": bool, "fields": {колонка: значение}}
+_pending_users = {}
+# Пачка, которая прямо сейчас записывается в БД (видна для чтения до коммита)
+_flushing_users = {}
+_flush_event = None
+_flush_task = None
+
+# Колонки профиля, которые возвращает get_user_data (в этом порядке)
+PROFILE_COLUMNS = (
+    "birth_date",
+    "zodiac_sign",
+    "birth_time",
+    "birth_place",
+    "birth_day",
+    "birth_month",
+    "birth_year",
+    "life_number",
+)
+
+# Маркер "нет в кэше" (None - допустимое закэшированное значение)
+_MISSING = object()
+
+
+async def get_db():
+    """Возвращает общее соединение с БД, открывая его при первом обращении"""
+    global _db
+    if _db is None:
+        _db = await aiosqlite.connect(DB_NAME)
+        for pragma in DB_PRAGMAS:
+            await _db.execute(pragma)
+    return _db
+
+
+async def close_db():
+    """Закрывает общее соединение с БД (вызывать при остановке бота)"""
+    global _db, _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    if _db is not None:
+        # Сбрасываем всё, что ещё не записано
+        await flush_pending_writes()
+        await _db.close()
+        _db = None
+
+
 async def init_db():
-    async with aiosqlite.connect(DB_NAME) as db:
+    db = await get_db()
+    async with _write_lock:
         await db.execute("""
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY,
@@ -17,46 +105,615 @@ async def init_db():
                 birth_place TEXT
             )
         """)
+        # Частичный индекс для постраничного обхода подписчиков по tg_id
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_users_subscribed
+            ON users (tg_id)
+            WHERE subscribed = TRUE AND zodiac_sign IS NOT NULL
+        """)
         await db.commit()
+        await _run_migrations(db)
 
-async def save_user(tg_id):
-    async with aiosqlite.connect(DB_NAME) as db:
-        await db.execute("""
-            INSERT OR IGNORE INTO users (tg_id) VALUES (?)
-        """, (tg_id,))
+    _start_write_behind()
+
+
+# --- МИГРАЦИИ СХЕМЫ ---
+def _split_birth_date(birth_date):
+    """Дата "ДД.ММ.ГГГГ" -> (день, месяц, год); для некорректной даты три None"""
+    try:
+        day, month, year = map(int, birth_date.split("."))
+    except (AttributeError, ValueError):
+        return None, None, None
+    if not (1 <= day <= 31) or not (1 <= month <= 12) or not (1900 <= year <= 2030):
+        return None, None, None
+    return day, month, year
+
+
+def parse_birth_date(birth_date):
+    """
+    Разбирает дату "ДД.ММ.ГГГГ" в (день, месяц, год, число жизни).
+    Для пустой или некорректной даты возвращает четыре None.
+    """
+    day, month, year = _split_birth_date(birth_date)
+    if day is None:
+        return None, None, None, None
+    return day, month, year, calculate_life_number(day, month, year)
+
+
+async def _migration_001_birth_columns(db):
+    """Числовые колонки даты рождения и сохранённое число жизни"""
+    async with db.execute("PRAGMA table_info(users)") as cursor:
+        existing = {row[1] for row in await cursor.fetchall()}
+    for column in ("birth_day", "birth_month", "birth_year", "life_number"):
+        if column not in existing:
+            await db.execute(f"ALTER TABLE users ADD COLUMN {column} INTEGER")
+
+    # Заполняем новые колонки пачками по id
+    last_id = 0
+    while True:
+        async with db.execute(
+            """
+            SELECT id, birth_date FROM users
+            WHERE id > ? AND birth_date IS NOT NULL
+            ORDER BY id LIMIT ?
+            """,
+            (last_id, MIGRATION_BATCH_SIZE),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        if not rows:
+            break
+        # Числа жизни для всей пачки считаются пакетно
+        dates = [_split_birth_date(birth_date) for _, birth_date in rows]
+        valid_dates = [parts for parts in dates if parts[0] is not None]
+        numbers = iter(life_numbers(*zip(*valid_dates)) if valid_dates else ())
+        params = []
+        for (row_id, _), (day, month, year) in zip(rows, dates):
+            life_number = int(next(numbers)) if day is not None else None
+            params.append((day, month, year, life_number, row_id))
+        await db.executemany(
+            """
+            UPDATE users
+            SET birth_day = ?, birth_month = ?, birth_year = ?, life_number = ?
+            WHERE id = ?
+            """,
+            params,
+        )
         await db.commit()
+        last_id = rows[-1][0]
 
-async def update_user_data(tg_id, birth_date, zodiac_sign, birth_time=None, birth_place=None):
-    async with aiosqlite.connect(DB_NAME) as db:
-        await db.execute("""
-            UPDATE users 
-            SET birth_date = ?, zodiac_sign = ?, birth_time = ?, birth_place = ? 
-            WHERE tg_id = ?
-        """, (birth_date, zodiac_sign, birth_time, birth_place, tg_id))
+
+async def _migration_002_fsm_states(db):
+    """Таблица состояний FSM регистрации"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS fsm_states (
+            key TEXT PRIMARY KEY,
+            state TEXT,
+            data TEXT NOT NULL DEFAULT '{}',
+            updated_at REAL NOT NULL
+        )
+    """)
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_fsm_states_updated_at ON fsm_states (updated_at)"
+    )
+
+
+async def _migration_003_horoscope_cache(db):
+    """Постоянный кэш ежедневных гороскопов по знаку и дате"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS horoscope_cache (
+            sign TEXT NOT NULL,
+            date TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (sign, date)
+        )
+    """)
+
+
+async def _migration_004_translation_cache(db):
+    """Постоянный кэш переводов по хэшу текста и языковой пары"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS translation_cache (
+            key TEXT PRIMARY KEY,
+            translated TEXT NOT NULL,
+            last_used REAL NOT NULL
+        )
+    """)
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_translation_cache_last_used ON translation_cache (last_used)"
+    )
+
+
+async def _migration_005_natal_chart_cache(db):
+    """Постоянный кэш натальных карт по дате, времени и месту рождения"""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS natal_chart_cache (
+            birth_date TEXT NOT NULL,
+            birth_time TEXT NOT NULL,
+            birth_place TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (birth_date, birth_time, birth_place)
+        )
+    """)
+
+
+# Упорядоченный список миграций: (версия, функция)
+MIGRATIONS = [
+    (1, _migration_001_birth_columns),
+    (2, _migration_002_fsm_states),
+    (3, _migration_003_horoscope_cache),
+    (4, _migration_004_translation_cache),
+    (5, _migration_005_natal_chart_cache),
+]
+
+
+async def _run_migrations(db):
+    """Применяет миграции новее версии схемы, записанной в PRAGMA user_version"""
+    async with db.execute("PRAGMA user_version") as cursor:
+        current_version = (await cursor.fetchone())[0]
+    for version, migration in MIGRATIONS:
+        if version <= current_version:
+            continue
+        print(f"Применяем миграцию БД {version}: {migration.__doc__}")
+        await migration(db)
+        await db.execute(f"PRAGMA user_version = {version}")
         await db.commit()
+# --- КОНЕЦ МИГРАЦИЙ СХЕМЫ ---
+
+
+# --- КЭШ ПРОФИЛЕЙ ---
+class ProfileCache:
+    """LRU-кэш профилей с ограничением размера и временем жизни записей"""
+
+    def __init__(self, max_size=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # tg_id -> (время_истечения, профиль)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tg_id):
+        """Возвращает профиль или _MISSING, если его нет или он устарел"""
+        item = self._data.get(tg_id)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._data[tg_id]
+            self.misses += 1
+            return _MISSING
+        self._data.move_to_end(tg_id)
+        self.hits += 1
+        return item[1]
+
+    def set(self, tg_id, profile):
+        self._data[tg_id] = (time.monotonic() + self.ttl, profile)
+        self._data.move_to_end(tg_id)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def peek(self, tg_id):
+        """Возвращает профиль без учёта статистики и порядка LRU"""
+        item = self._data.get(tg_id)
+        return _MISSING if item is None else item[1]
+
+    def invalidate(self, tg_id=None):
+        """Удаляет профиль пользователя или, без аргумента, весь кэш"""
+        if tg_id is None:
+            self._data.clear()
+        else:
+            self._data.pop(tg_id, None)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+profile_cache = ProfileCache()
+
+
+def get_profile_cache_stats():
+    """Счётчики попаданий/промахов кэша профилей (для мониторинга)"""
+    return profile_cache.stats()
+# --- КОНЕЦ КЭША ПРОФИЛЕЙ ---
+
+
+# --- ОТЛОЖЕННАЯ ЗАПИСЬ ---
+def _start_write_behind():
+    """Запускает фоновую задачу периодического сброса изменений"""
+    global _flush_event, _flush_task
+    if _flush_event is None:
+        _flush_event = asyncio.Event()
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_flush_loop())
+
+
+async def _flush_loop():
+    """Сбрасывает накопленные изменения по таймеру или по сигналу переполнения"""
+    while True:
+        try:
+            await asyncio.wait_for(_flush_event.wait(), timeout=WRITE_BEHIND_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _flush_event.clear()
+        try:
+            await flush_pending_writes()
+        except Exception as e:
+            print(f"Ошибка при сбросе отложенных записей: {e}")
+
+
+def _queue_user_write(tg_id, insert=False, **fields):
+    """Ставит изменение пользователя в очередь, объединяя его с уже ожидающими"""
+    entry = _pending_users.setdefault(tg_id, {"insert": False, "fields": {}})
+    entry["insert"] = entry["insert"] or insert
+    entry["fields"].update(fields)
+    if len(_pending_users) >= WRITE_BEHIND_MAX_BATCH and _flush_event is not None:
+        _flush_event.set()
+
+
+async def flush_pending_writes():
+    """Записывает все ожидающие изменения в БД одной транзакцией"""
+    global _pending_users, _flushing_users
+    if not _pending_users:
+        return
+    db = await get_db()
+    async with _write_lock:
+        batch = _pending_users
+        if not batch:
+            return
+        _pending_users = {}
+        _flushing_users = batch
+        try:
+            inserts = [(tg_id,) for tg_id, entry in batch.items() if entry["insert"]]
+            if inserts:
+                await db.executemany(
+                    "INSERT OR IGNORE INTO users (tg_id) VALUES (?)", inserts
+                )
+            # Группируем UPDATE по набору колонок, чтобы выполнить их через executemany
+            updates = {}
+            for tg_id, entry in batch.items():
+                if entry["fields"]:
+                    columns = tuple(sorted(entry["fields"]))
+                    params = tuple(entry["fields"][c] for c in columns) + (tg_id,)
+                    updates.setdefault(columns, []).append(params)
+            for columns, rows in updates.items():
+                assignments = ", ".join(f"{c} = ?" for c in columns)
+                await db.executemany(
+                    f"UPDATE users SET {assignments} WHERE tg_id = ?", rows
+                )
+            await db.commit()
+        except BaseException:
+            # BaseException: отмена задачи сброса тоже не должна терять данные
+            await db.rollback()
+            # Возвращаем пачку в очередь, не затирая более свежие изменения
+            for tg_id, entry in batch.items():
+                newer = _pending_users.get(tg_id)
+                if newer is not None:
+                    entry["insert"] = entry["insert"] or newer["insert"]
+                    entry["fields"].update(newer["fields"])
+                _pending_users[tg_id] = entry
+            raise
+        finally:
+            _flushing_users = {}
+
+
+def _apply_pending(tg_id, row):
+    """Накладывает ещё не записанные изменения пользователя на строку из БД"""
+    entries = [e for e in (_flushing_users.get(tg_id), _pending_users.get(tg_id)) if e]
+    if not entries:
+        return row
+    if row is None:
+        if not any(e["insert"] for e in entries):
+            return None
+        row = (None,) * len(PROFILE_COLUMNS)
+    values = dict(zip(PROFILE_COLUMNS, row))
+    for entry in entries:
+        for column in values:
+            if column in entry["fields"]:
+                values[column] = entry["fields"][column]
+    return tuple(values.values())
+# --- КОНЕЦ ОТЛОЖЕННОЙ ЗАПИСИ ---
+
+
+async def save_user(tg_id):
+    _queue_user_write(tg_id, insert=True)
+    # Неизвестный до этого пользователь теперь существует с пустым профилем
+    if profile_cache.peek(tg_id) is None:
+        profile_cache.set(tg_id, (None,) * len(PROFILE_COLUMNS))
+
+async def update_user_data(tg_id, birth_date, zodiac_sign, birth_time=None, birth_place=None):
+    birth_day, birth_month, birth_year, life_number = parse_birth_date(birth_date)
+    profile = (
+        birth_date,
+        zodiac_sign,
+        birth_time,
+        birth_place,
+        birth_day,
+        birth_month,
+        birth_year,
+        life_number,
+    )
+    _queue_user_write(tg_id, **dict(zip(PROFILE_COLUMNS, profile)))
+    # Запись в кэш: UPDATE не создаёт строку, поэтому неизвестного пользователя сбрасываем
+    cached = profile_cache.peek(tg_id)
+    if cached is _MISSING or cached is None:
+        profile_cache.invalidate(tg_id)
+    else:
+        profile_cache.set(tg_id, profile)
 
 async def subscribe_user(tg_id):
-    async with aiosqlite.connect(DB_NAME) as db:
-        await db.execute("""
-            UPDATE users SET subscribed = TRUE WHERE tg_id = ?
-        """, (tg_id,))
-        await db.commit()
+    _queue_user_write(tg_id, subscribed=True)
+    # Профиль не содержит флаг подписки, закэшированная запись остаётся верной
 
 async def unsubscribe_user(tg_id):
-    async with aiosqlite.connect(DB_NAME) as db:
-        await db.execute("""
-            UPDATE users SET subscribed = FALSE WHERE tg_id = ?
-        """, (tg_id,))
-        await db.commit()
+    _queue_user_write(tg_id, subscribed=False)
 
 async def get_subscribed_users():
-    async with aiosqlite.connect(DB_NAME) as db:
-        async with db.execute("SELECT tg_id, zodiac_sign FROM users WHERE subscribed = TRUE AND zodiac_sign IS NOT NULL") as cursor:
+    await flush_pending_writes()
+    db = await get_db()
+    async with db.execute("SELECT tg_id, zodiac_sign FROM users WHERE subscribed = TRUE AND zodiac_sign IS NOT NULL") as cursor:
+        rows = await cursor.fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+async def iter_subscribed_users(batch_size=500):
+    """
+    Постраничный обход подписчиков по tg_id (keyset-пагинация, без OFFSET).
+    Отдаёт пары (tg_id, zodiac_sign), держа в памяти не более одной страницы.
+    """
+    # Подписки, сделанные перед рассылкой, должны попасть в выборку
+    await flush_pending_writes()
+    db = await get_db()
+    last_tg_id = None
+    while True:
+        if last_tg_id is None:
+            query = """
+                SELECT tg_id, zodiac_sign FROM users
+                WHERE subscribed = TRUE AND zodiac_sign IS NOT NULL
+                ORDER BY tg_id LIMIT ?
+            """
+            params = (batch_size,)
+        else:
+            query = """
+                SELECT tg_id, zodiac_sign FROM users
+                WHERE subscribed = TRUE AND zodiac_sign IS NOT NULL AND tg_id > ?
+                ORDER BY tg_id LIMIT ?
+            """
+            params = (last_tg_id, batch_size)
+        async with db.execute(query, params) as cursor:
             rows = await cursor.fetchall()
-            return [(row[0], row[1]) for row in rows]
+        if not rows:
+            return
+        for row in rows:
+            yield row[0], row[1]
+        if len(rows) < batch_size:
+            return
+        last_tg_id = rows[-1][0]
 
 async def get_user_data(tg_id):
-    async with aiosqlite.connect(DB_NAME) as db:
-        async with db.execute("SELECT birth_date, zodiac_sign, birth_time, birth_place FROM users WHERE tg_id = ?", (tg_id,)) as cursor:
+    cached = profile_cache.get(tg_id)
+    if cached is not _MISSING:
+        return cached
+    db = await get_db()
+    # Под блокировкой сброс не может идти параллельно: SELECT не увидит
+    # незакоммиченную половину пачки, а наложение - очищенную _flushing_users
+    async with _write_lock:
+        async with db.execute(f"SELECT {', '.join(PROFILE_COLUMNS)} FROM users WHERE tg_id = ?", (tg_id,)) as cursor:
             row = await cursor.fetchone()
-            return row
\ No newline at end of file
+        row = _apply_pending(tg_id, row)
+        profile_cache.set(tg_id, row)
+    return row
+
+
+# --- СОСТОЯНИЯ FSM ---
+# Пишутся сразу, минуя отложенную запись: их читают и другие процессы бота
+async def get_fsm_record(key, min_updated_at):
+    """Возвращает (state, data_json) или None, если записи нет или она устарела"""
+    db = await get_db()
+    async with db.execute(
+        "SELECT state, data FROM fsm_states WHERE key = ? AND updated_at >= ?",
+        (key, min_updated_at),
+    ) as cursor:
+        return await cursor.fetchone()
+
+async def upsert_fsm_state(key, state, min_updated_at):
+    """Записывает состояние; данные устаревшей сессии (старше min_updated_at) сбрасываются"""
+    db = await get_db()
+    async with _write_lock:
+        await db.execute("""
+            INSERT INTO fsm_states (key, state, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                state = excluded.state,
+                data = CASE WHEN fsm_states.updated_at < ? THEN '{}' ELSE fsm_states.data END,
+                updated_at = excluded.updated_at
+        """, (key, state, time.time(), min_updated_at))
+        await db.commit()
+
+async def upsert_fsm_data(key, data_json, min_updated_at):
+    """Записывает данные; состояние устаревшей сессии (старше min_updated_at) сбрасывается"""
+    db = await get_db()
+    async with _write_lock:
+        await db.execute("""
+            INSERT INTO fsm_states (key, data, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                state = CASE WHEN fsm_states.updated_at < ? THEN NULL ELSE fsm_states.state END,
+                data = excluded.data,
+                updated_at = excluded.updated_at
+        """, (key, data_json, time.time(), min_updated_at))
+        await db.commit()
+
+async def delete_expired_fsm_records(min_updated_at):
+    """Удаляет брошенные сессии и пустые записи; возвращает число удалённых строк"""
+    db = await get_db()
+    async with _write_lock:
+        cursor = await db.execute(
+            "DELETE FROM fsm_states WHERE updated_at < ? OR (state IS NULL AND data = '{}')",
+            (min_updated_at,),
+        )
+        await db.commit()
+        return cursor.rowcount
+# --- КОНЕЦ СОСТОЯНИЙ FSM ---
+
+
+# --- ПОСТОЯННЫЙ КЭШ ГОРОСКОПОВ ---
+async def get_cached_horoscope(sign, date):
+    """Возвращает сохранённый гороскоп (dict) для знака и даты ГГГГ-ММ-ДД или None"""
+    db = await get_db()
+    async with db.execute(
+        "SELECT payload FROM horoscope_cache WHERE sign = ? AND date = ?", (sign, date)
+    ) as cursor:
+        row = await cursor.fetchone()
+    return json.loads(row[0]) if row else None
+
+async def save_cached_horoscope(sign, date, horoscope):
+    db = await get_db()
+    async with _write_lock:
+        await db.execute(
+            "INSERT OR REPLACE INTO horoscope_cache (sign, date, payload, created_at) VALUES (?, ?, ?, ?)",
+            (sign, date, json.dumps(horoscope, ensure_ascii=False), time.time()),
+        )
+        await db.commit()
+
+async def delete_cached_horoscopes_before(date):
+    """Удаляет гороскопы за дни раньше указанной даты"""
+    db = await get_db()
+    async with _write_lock:
+        await db.execute("DELETE FROM horoscope_cache WHERE date < ?", (date,))
+        await db.commit()
+# --- КОНЕЦ ПОСТОЯННОГО КЭША ГОРОСКОПОВ ---
+
+
+# --- ПОСТОЯННЫЙ КЭШ ПЕРЕВОДОВ ---
+# Число строк в translation_cache (None - ещё не считали); сверх лимита
+# таблица чистится при очередной записи, а не при каждой
+_translation_cache_rows = None
+
+async def get_cached_translation(key):
+    """Возвращает сохранённый перевод по ключу-хэшу или None; попадание обновляет last_used"""
+    db = await get_db()
+    async with db.execute(
+        "SELECT translated FROM translation_cache WHERE key = ?", (key,)
+    ) as cursor:
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    async with _write_lock:
+        await db.execute(
+            "UPDATE translation_cache SET last_used = ? WHERE key = ?", (time.time(), key)
+        )
+        await db.commit()
+    return row[0]
+
+async def _count_translation_rows(db):
+    async with db.execute("SELECT COUNT(*) FROM translation_cache") as cursor:
+        return (await cursor.fetchone())[0]
+
+async def save_cached_translation(key, translated, max_rows):
+    """Сохраняет перевод; сверх max_rows удаляет давно не использованные"""
+    global _translation_cache_rows
+    db = await get_db()
+    async with _write_lock:
+        if _translation_cache_rows is None:
+            _translation_cache_rows = await _count_translation_rows(db)
+        cursor = await db.execute(
+            "INSERT OR REPLACE INTO translation_cache (key, translated, last_used) VALUES (?, ?, ?)",
+            (key, translated, time.time()),
+        )
+        # Замена существующей строки тоже считается: лишний пересчёт безвреден
+        _translation_cache_rows += cursor.rowcount
+        if _translation_cache_rows > max_rows:
+            await db.execute("""
+                DELETE FROM translation_cache WHERE key IN (
+                    SELECT key FROM translation_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (max_rows,))
+            _translation_cache_rows = await _count_translation_rows(db)
+        await db.commit()
+# --- КОНЕЦ ПОСТОЯННОГО КЭША ПЕРЕВОДОВ ---
+
+
+# --- ПОСТОЯННЫЙ КЭШ НАТАЛЬНЫХ КАРТ ---
+async def get_cached_natal_chart(birth_date, birth_time, birth_place):
+    """Возвращает сохранённую карту (dict) или None; время и место - нормализованные ключи"""
+    db = await get_db()
+    async with db.execute(
+        "SELECT payload FROM natal_chart_cache WHERE birth_date = ? AND birth_time = ? AND birth_place = ?",
+        (birth_date, birth_time, birth_place),
+    ) as cursor:
+        row = await cursor.fetchone()
+    return json.loads(row[0]) if row else None
+
+async def save_cached_natal_chart(birth_date, birth_time, birth_place, chart):
+    db = await get_db()
+    async with _write_lock:
+        await db.execute(
+            "INSERT OR REPLACE INTO natal_chart_cache (birth_date, birth_time, birth_place, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+            (birth_date, birth_time, birth_place, json.dumps(chart), time.time()),
+        )
+        await db.commit()
+# --- КОНЕЦ ПОСТОЯННОГО КЭША НАТАЛЬНЫХ КАРТ ---
+
+
+# --- ПАКЕТНЫЕ ПРОВЕРКИ И СТАТИСТИКА ---
+async def _fetch_birth_rows():
+    """(tg_id, zodiac_sign, birth_day, birth_month, birth_year, life_number) всех пользователей с датой рождения"""
+    await flush_pending_writes()
+    db = await get_db()
+    async with db.execute("""
+        SELECT tg_id, zodiac_sign, birth_day, birth_month, birth_year, life_number
+        FROM users
+        WHERE birth_day IS NOT NULL AND birth_month IS NOT NULL AND birth_year IS NOT NULL
+    """) as cursor:
+        return await cursor.fetchall()
+
+async def audit_astro_columns(fix=False):
+    """
+    Сверяет сохранённые знак зодиака и число жизни с пересчитанными пакетно.
+    Знак считается верным, если совпадает с усреднёнными датами перехода или
+    с датами перехода года рождения. С fix=True расхождения исправляются
+    через отложенную запись.
+    """
+    rows = await _fetch_birth_rows()
+    report = {"checked": len(rows), "sign_mismatches": 0, "life_number_mismatches": 0, "fixed": 0}
+    if not rows:
+        return report
+    tg_ids, stored_signs, days, months, years, stored_life = zip(*rows)
+    fixed_codes = sign_codes(days, months)
+    dated_codes = sign_codes(days, months, years)
+    computed_life = life_numbers(days, months, years)
+    sign_index = {name: code for code, name in enumerate(ZODIAC_SIGNS)}
+
+    for i, tg_id in enumerate(tg_ids):
+        fields = {}
+        stored_code = sign_index.get(stored_signs[i])
+        if dated_codes[i] >= 0 and stored_code not in (fixed_codes[i], dated_codes[i]):
+            report["sign_mismatches"] += 1
+            fields["zodiac_sign"] = ZODIAC_SIGNS[dated_codes[i]]
+        if stored_life[i] != computed_life[i]:
+            report["life_number_mismatches"] += 1
+            fields["life_number"] = int(computed_life[i])
+        if fix and fields:
+            _queue_user_write(tg_id, **fields)
+            profile_cache.invalidate(tg_id)
+            report["fixed"] += 1
+    if fix and report["fixed"]:
+        await flush_pending_writes()
+    return report
+
+async def get_birth_statistics():
+    """Распределение пользователей по знакам (с учётом года рождения) и числам жизни"""
+    rows = await _fetch_birth_rows()
+    if not rows:
+        return {"users": 0, "signs": {}, "life_numbers": {}}
+    _, _, days, months, years, _ = zip(*rows)
+    signs = Counter(sign_names(sign_codes(days, months, years)))
+    life = Counter(int(n) for n in life_numbers(days, months, years))
+    return {
+        "users": len(rows),
+        "signs": dict(signs.most_common()),
+        "life_numbers": dict(sorted(life.items())),
+    }
+# --- КОНЕЦ ПАКЕТНЫХ ПРОВЕРОК И СТАТИСТИКИ ---
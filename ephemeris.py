@@ -0,0 +1,208 @@
+# ephemeris.py
+
+import math
+
+# Юлианская дата эпохи J2000.0
+J2000 = 2451545.0
+
+# Кеплеровы элементы орбит относительно эклиптики и равноденствия J2000
+# (E. M. Standish, JPL, "Keplerian Elements for Approximate Positions of the
+# Major Planets", таблица 1, 1800-2050 гг.; за пределами диапазона точность
+# падает постепенно). Для каждой планеты - значение на J2000 и изменение за
+# юлианское столетие:
+# a (а.е.), e, I (°), L - средняя долгота (°), ϖ - долгота перигелия (°),
+# Ω - долгота восходящего узла (°)
+ORBITAL_ELEMENTS = {
+    "mercury": (
+        (0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+        (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081),
+    ),
+    "venus": (
+        (0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+        (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418),
+    ),
+    # Барицентр системы Земля-Луна
+    "earth": (
+        (1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+        (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0),
+    ),
+    "mars": (
+        (1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+        (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343),
+    ),
+    "jupiter": (
+        (5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909),
+        (-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106),
+    ),
+    "saturn": (
+        (9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+        (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794),
+    ),
+    "uranus": (
+        (19.18916464, 0.04725744, 0.77263783, 313.23810451, 170.95427630, 74.01692503),
+        (-0.00196176, -0.00004397, -0.00242939, 428.48202785, 0.40805281, 0.04240589),
+    ),
+    "neptune": (
+        (30.06992276, 0.00859048, 1.77004347, -55.12002969, 44.96476227, 131.78422574),
+        (0.00026291, 0.00005105, 0.00035372, 218.45945325, -0.32241464, -0.00508664),
+    ),
+    "pluto": (
+        (39.48211675, 0.24882730, 17.14001206, 238.92903833, 224.06891629, 110.30393684),
+        (-0.00031596, 0.00005170, 0.00004818, 145.20780515, -0.04062942, -0.01183482),
+    ),
+}
+
+# Главные периодические члены долготы Луны (Meeus, "Astronomical Algorithms",
+# гл. 47): (множители D, M, M', F, коэффициент в миллионных долях градуса);
+# члены с M умножаются на E в степени |множителя M|
+_MOON_LONGITUDE_TERMS = (
+    (0, 0, 1, 0, 6288774),
+    (2, 0, -1, 0, 1274027),
+    (2, 0, 0, 0, 658314),
+    (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116),
+    (0, 0, 0, 2, -114332),
+    (2, 0, -2, 0, 58793),
+    (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322),
+    (2, -1, 0, 0, 45758),
+    (0, 1, -1, 0, -40923),
+    (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383),
+    (2, 0, 0, -2, 15327),
+    (0, 0, 1, 2, -12528),
+    (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675),
+    (0, 0, 3, 0, 10034),
+    (4, 0, -2, 0, 8548),
+    (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766),
+    (1, 0, -1, 0, -5163),
+    (1, 1, 0, 0, 4987),
+    (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994),
+    (4, 0, 0, 0, 3861),
+    (2, 0, -3, 0, 3665),
+    (0, 1, -2, 0, -2689),
+    (2, 0, -1, 2, -2602),
+    (2, -1, -2, 0, 2390),
+    (1, 0, 1, 0, -2348),
+    (2, -2, 0, 0, 2236),
+    (0, 1, 2, 0, -2120),
+    (0, 2, 0, 0, -2069),
+)
+
+
+def _solve_kepler(mean_anomaly: float, e: float) -> float:
+    """Эксцентрическая аномалия (рад) по средней аномалии (рад), метод Ньютона"""
+    eccentric = mean_anomaly + e * math.sin(mean_anomaly)
+    for _ in range(10):
+        delta = (eccentric - e * math.sin(eccentric) - mean_anomaly) / (
+            1 - e * math.cos(eccentric)
+        )
+        eccentric -= delta
+        if abs(delta) < 1e-12:
+            break
+    return eccentric
+
+
+def heliocentric_position(planet: str, jd: float) -> tuple:
+    """
+    Гелиоцентрические эклиптические координаты планеты (x, y, z) в а.е.
+    для юлианской даты jd.
+    """
+    base, rate = ORBITAL_ELEMENTS[planet]
+    t = (jd - J2000) / 36525
+    a, e, inclination, mean_longitude, perihelion, node = (
+        value + change * t for value, change in zip(base, rate)
+    )
+    mean_anomaly = math.radians((mean_longitude - perihelion + 180) % 360 - 180)
+    eccentric = _solve_kepler(mean_anomaly, e)
+
+    # Координаты в плоскости орбиты
+    x_orbit = a * (math.cos(eccentric) - e)
+    y_orbit = a * math.sqrt(1 - e * e) * math.sin(eccentric)
+
+    # Поворот в плоскость эклиптики
+    argument = math.radians(perihelion - node)
+    node = math.radians(node)
+    inclination = math.radians(inclination)
+    cos_w, sin_w = math.cos(argument), math.sin(argument)
+    cos_n, sin_n = math.cos(node), math.sin(node)
+    cos_i, sin_i = math.cos(inclination), math.sin(inclination)
+    x = (cos_w * cos_n - sin_w * sin_n * cos_i) * x_orbit + (
+        -sin_w * cos_n - cos_w * sin_n * cos_i
+    ) * y_orbit
+    y = (cos_w * sin_n + sin_w * cos_n * cos_i) * x_orbit + (
+        -sin_w * sin_n + cos_w * cos_n * cos_i
+    ) * y_orbit
+    z = sin_w * sin_i * x_orbit + cos_w * sin_i * y_orbit
+    return x, y, z
+
+
+def geocentric_longitude(planet: str, jd: float) -> float:
+    """Геоцентрическая эклиптическая долгота планеты в градусах [0, 360)"""
+    px, py, _ = heliocentric_position(planet, jd)
+    ex, ey, _ = heliocentric_position("earth", jd)
+    return math.degrees(math.atan2(py - ey, px - ex)) % 360
+
+
+def _centuries(jd: float) -> float:
+    return (jd - J2000) / 36525
+
+
+def precession_since_j2000(jd: float) -> float:
+    """Общая прецессия по долготе от J2000 до даты, градусы"""
+    return 1.3969713 * _centuries(jd)
+
+
+def apparent_longitude(planet: str, jd: float) -> float:
+    """Геоцентрическая долгота планеты от равноденствия даты, градусы [0, 360)"""
+    return (geocentric_longitude(planet, jd) + precession_since_j2000(jd)) % 360
+
+
+def sun_longitude(jd: float) -> float:
+    """Видимая долгота Солнца от равноденствия даты, градусы [0, 360)"""
+    x, y, _ = heliocentric_position("earth", jd)
+    longitude = math.degrees(math.atan2(-y, -x))
+    # Годичная аберрация (-20.5")
+    longitude += precession_since_j2000(jd) - 20.5 / 3600
+    return longitude % 360
+
+
+def moon_longitude(jd: float) -> float:
+    """Геоцентрическая долгота Луны от равноденствия даты, градусы [0, 360); точность ~0.1°"""
+    t = _centuries(jd)
+    mean_longitude = 218.3164477 + 481267.88123421 * t
+    elongation = math.radians(297.8501921 + 445267.1114034 * t)
+    sun_anomaly = math.radians(357.5291092 + 35999.0502909 * t)
+    moon_anomaly = math.radians(134.9633964 + 477198.8675055 * t)
+    latitude_argument = math.radians(93.2720950 + 483202.0175233 * t)
+    e = 1 - 0.002516 * t - 0.0000074 * t * t
+    correction = 0.0
+    for d_mult, m_mult, mp_mult, f_mult, coefficient in _MOON_LONGITUDE_TERMS:
+        angle = (
+            d_mult * elongation
+            + m_mult * sun_anomaly
+            + mp_mult * moon_anomaly
+            + f_mult * latitude_argument
+        )
+        correction += coefficient * e ** abs(m_mult) * math.sin(angle)
+    return (mean_longitude + correction / 1e6) % 360
+
+
+def obliquity(jd: float) -> float:
+    """Средний наклон эклиптики к экватору, градусы"""
+    return 23.439291 - 0.0130042 * _centuries(jd)
+
+
+def local_sidereal_time(jd: float, east_longitude: float) -> float:
+    """Местное среднее звёздное время в градусах [0, 360)"""
+    t = _centuries(jd)
+    greenwich = (
+        280.46061837
+        + 360.98564736629 * (jd - J2000)
+        + 0.000387933 * t * t
+        - t**3 / 38710000
+    )
+    return (greenwich + east_longitude) % 360
@@ -0,0 +1,67 @@
+# fsm_storage.py
+
+import json
+import time
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, StorageKey
+
+from config import FSM_SESSION_TTL, FSM_CLEANUP_INTERVAL
+from database import (
+    get_fsm_record,
+    upsert_fsm_state,
+    upsert_fsm_data,
+    delete_expired_fsm_records,
+)
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    Хранилище FSM в users.db.
+    Состояния переживают перезапуск и доступны нескольким процессам бота;
+    сессии без активности дольше ttl секунд считаются брошенными.
+    """
+
+    def __init__(self, ttl: int = FSM_SESSION_TTL, cleanup_interval: int = FSM_CLEANUP_INTERVAL):
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self.key_builder = DefaultKeyBuilder(
+            with_bot_id=True, with_business_connection_id=True, with_destiny=True
+        )
+        self._last_cleanup = 0.0
+
+    async def _maybe_cleanup(self) -> None:
+        """Периодически удаляет устаревшие записи"""
+        now = time.time()
+        if now - self._last_cleanup < self.cleanup_interval:
+            return
+        self._last_cleanup = now
+        removed = await delete_expired_fsm_records(now - self.ttl)
+        if removed:
+            print(f"Удалено брошенных сессий FSM: {removed}")
+
+    async def set_state(self, key: StorageKey, state: str | State | None = None) -> None:
+        if isinstance(state, State):
+            state = state.state
+        await upsert_fsm_state(self.key_builder.build(key), state, time.time() - self.ttl)
+        await self._maybe_cleanup()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        record = await get_fsm_record(self.key_builder.build(key), time.time() - self.ttl)
+        return record[0] if record else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await upsert_fsm_data(
+            self.key_builder.build(key),
+            json.dumps(dict(data), ensure_ascii=False),
+            time.time() - self.ttl,
+        )
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = await get_fsm_record(self.key_builder.build(key), time.time() - self.ttl)
+        return json.loads(record[1]) if record else {}
+
+    async def close(self) -> None:
+        # Соединение с БД общее и закрывается в database.close_db
+        pass
@@ -1,7 +1,12 @@
 # horoscope_api.py
+import asyncio
+import codecs
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import aiohttp
 import random
-from datetime import datetime
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
 import urllib.parse
 import hashlib
 import re
@@ -10,18 +15,84 @@ import json
 # Импортируем необходимые функции из других модулей
 # Убедитесь, что эти файлы существуют и доступны
 try:
-    from config import HOROSCOPE_SOURCES, ASTRO_API_BASE
+    from config import (
+        HOROSCOPE_SOURCES,
+        ASTRO_API_BASE,
+        HTTP_POOL_LIMIT,
+        HTTP_POOL_LIMIT_PER_HOST,
+        HTTP_KEEPALIVE_TIMEOUT,
+        HTTP_DNS_CACHE_TTL,
+        HOROSCOPE_CACHE_SIZE,
+        PARSE_POOL_KIND,
+        PARSE_POOL_SIZE,
+        PARSE_TIMEOUT,
+        HEDGED_FETCH_ENABLED,
+        HEDGE_DELAY,
+        FORECAST_DEADLINE,
+        BREAKER_FAILURE_THRESHOLD,
+        BREAKER_COOLDOWN,
+        TRANSLATION_CACHE_MAX_CHARS,
+        TRANSLATION_CACHE_MAX_ROWS,
+        TRANSLATION_RACE_ENABLED,
+        TRANSLATION_RACE_STAGGER,
+        TRANSLATION_DEADLINE,
+        NATAL_CHART_CACHE_SIZE,
+        DEFAULT_FORECAST_CACHE_TTL,
+    )
     from zodiac import (
         get_zodiac_sign,
+        get_zodiac_sign_for_date,
         ZODIAC_API_MAP,
     )  # <-- ВАЖНО: Импортируем get_zodiac_sign
 except ImportError as e:
     print(f"Предупреждение: Не удалось импортировать модули: {e}")
     HOROSCOPE_SOURCES = {}
     ASTRO_API_BASE = "https://aztro.sameerkumar.website"
+    HTTP_POOL_LIMIT = 100
+    HTTP_POOL_LIMIT_PER_HOST = 10
+    HTTP_KEEPALIVE_TIMEOUT = 30
+    HTTP_DNS_CACHE_TTL = 300
+    HOROSCOPE_CACHE_SIZE = 64
+    PARSE_POOL_KIND = "thread"
+    PARSE_POOL_SIZE = 2
+    PARSE_TIMEOUT = 5
+    HEDGED_FETCH_ENABLED = True
+    HEDGE_DELAY = 3
+    FORECAST_DEADLINE = 12
+    BREAKER_FAILURE_THRESHOLD = 3
+    BREAKER_COOLDOWN = 60
+    TRANSLATION_CACHE_MAX_CHARS = 2_000_000
+    TRANSLATION_CACHE_MAX_ROWS = 20000
+    TRANSLATION_RACE_ENABLED = True
+    TRANSLATION_RACE_STAGGER = 1
+    TRANSLATION_DEADLINE = 15
+    NATAL_CHART_CACHE_SIZE = 1000
+    DEFAULT_FORECAST_CACHE_TTL = 3600
     get_zodiac_sign = lambda d, m: "Неизвестно"
+    get_zodiac_sign_for_date = lambda d, m, y: "Неизвестно"
     ZODIAC_API_MAP = {"Овен": "aries"}
 
+from rambler_parser import ArticleTextParser, extract_article_paragraphs
+import http_cache
+from moon_phases import get_phase_name
+from mercury_retrograde import is_retrograde
+from natal_chart import (
+    compute_natal_chart,
+    format_natal_chart,
+    parse_birth_time,
+    resolve_place,
+)
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from database import (
+    get_cached_horoscope,
+    save_cached_horoscope,
+    delete_cached_horoscopes_before,
+    get_cached_translation,
+    save_cached_translation,
+    get_cached_natal_chart,
+    save_cached_natal_chart,
+)
+
 # --- Словари для улучшенного гороскопа ---
 # PLANET_INFLUENCES_DETAILED удален по запросу
 
@@ -68,14 +139,318 @@ ZODIAC_RAMBLER_URLS = {
     "Рыбы": "https://horoscopes.rambler.ru/pisces/today/",
 }
 
+# --- КЭШ ПРОГНОЗОВ НА ДЕНЬ ---
+class HoroscopeCache:
+    """
+    Ограниченный по размеру кэш прогнозов, ключ - (знак, дата ГГГГ-ММ-ДД).
+    Запись живёт до конца своего календарного дня по локальному времени бота.
+    """
+
+    def __init__(self, max_size: int = HOROSCOPE_CACHE_SIZE):
+        self.max_size = max_size
+        self._data = OrderedDict()  # (знак, дата) -> (момент_истечения, прогноз)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _expires_at(date: str) -> datetime:
+        """Полночь, следующая за указанной датой"""
+        return datetime.strptime(date, "%Y-%m-%d") + timedelta(days=1)
+
+    def get(self, sign: str, date: str = None):
+        """Возвращает прогноз знака на дату (по умолчанию сегодня) или None"""
+        key = (sign, date or datetime.now().strftime("%Y-%m-%d"))
+        item = self._data.get(key)
+        if item is not None and item[0] <= datetime.now():
+            del self._data[key]
+            self.expirations += 1
+            item = None
+        if item is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, sign: str, value: dict, date: str = None, ttl: float = None) -> None:
+        """ttl (секунды) сокращает жизнь записи, но не дальше конца её дня"""
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        key = (sign, date)
+        expires_at = self._expires_at(date)
+        if ttl is not None:
+            expires_at = min(expires_at, datetime.now() + timedelta(seconds=ttl))
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, sign: str = None) -> None:
+        """Удаляет прогнозы знака на все даты или, без аргумента, весь кэш"""
+        if sign is None:
+            self._data.clear()
+            return
+        for key in [key for key in self._data if key[0] == sign]:
+            del self._data[key]
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 # Кэш для хранения прогнозов на день
-horoscope_cache = {}
+horoscope_cache = HoroscopeCache()
+
+# --- ГОТОВЫЕ ТЕКСТЫ СООБЩЕНИЙ НА ДЕНЬ ---
+MESSAGE_ON_DEMAND = "on_demand"  # ответ на кнопку "Гороскоп"
+MESSAGE_BROADCAST = "broadcast"  # утренняя рассылка подписчикам
+
+
+def render_horoscope_messages(sign: str, horoscope_data: dict) -> dict:
+    """Готовые тексты сообщений с прогнозом знака для всех вариантов отправки"""
+    description = horoscope_data.get("description", "Гороскоп недоступен.")
+    broadcast = f"🌅 Доброе утро! Ежедневный гороскоп для {sign}\n\n"
+    if horoscope_data.get("date"):
+        broadcast += f"📅 {horoscope_data['date']}\n\n"
+    broadcast += f"{description}\n\n"
+    broadcast += "\n💫 Хорошего дня!"
+    return {MESSAGE_ON_DEMAND: description, MESSAGE_BROADCAST: broadcast}
+
+
+class RenderedMessageStore:
+    """
+    Готовые тексты сообщений по знакам на текущую дату. Заполняется вместе с
+    кэшем прогнозов, поэтому обработчики и рассылка только читают строку.
+    """
+
+    def __init__(self):
+        self._date = None
+        self._messages = {}  # знак -> {вариант: текст}
+
+    def put(self, sign: str, date: str, horoscope_data: dict) -> None:
+        if self._date is not None and date < self._date:
+            # Загрузка, начатая до полуночи, не должна сбросить тексты нового дня
+            return
+        if date != self._date:
+            # Новый день - тексты прошлой даты больше не нужны
+            self._date = date
+            self._messages = {}
+        self._messages[sign] = render_horoscope_messages(sign, horoscope_data)
+
+    def get(self, sign: str, variant: str, date: str):
+        if date != self._date:
+            return None
+        messages = self._messages.get(sign)
+        return messages[variant] if messages else None
+
+    def invalidate(self, sign: str = None) -> None:
+        if sign is None:
+            self._messages = {}
+        else:
+            self._messages.pop(sign, None)
+
+
+rendered_messages = RenderedMessageStore()
+
+
+# Размер куска при потоковом чтении HTML-страницы
+HTML_CHUNK_SIZE = 16 * 1024
+
+
+def get_horoscope_cache_stats() -> dict:
+    """Статистика кэша прогнозов (для мониторинга)"""
+    return horoscope_cache.stats()
+# --- КОНЕЦ КЭША ПРОГНОЗОВ НА ДЕНЬ ---
+
+# Загрузки гороскопов в процессе: (знак, дата, force_refresh) -> задача
+_inflight_horoscopes = {}
+# Счётчики объединения запросов: сколько загрузок запущено и сколько вызовов к ним присоединились
+horoscope_singleflight_stats = {"fetches": 0, "coalesced": 0}
+# Дата, за которую уже удалены устаревшие записи постоянного кэша
+_persistent_cache_cleanup_date = None
 # --- Конец словарей для улучшенного гороскопа ---
 
+# Общая HTTP-сессия для всех запросов к внешним сервисам
+_http_session = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Возвращает общую HTTP-сессию с пулом соединений, создавая её при первом обращении"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        )
+        _http_session = aiohttp.ClientSession(connector=connector)
+    return _http_session
+
+
+async def close_http_session() -> None:
+    """Закрывает общую HTTP-сессию (вызывать при остановке бота)"""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+# Автоматы защиты внешних сервисов: хост -> CircuitBreaker
+_circuit_breakers = {}
+
+
+def get_circuit_breaker(url: str) -> CircuitBreaker:
+    """Возвращает автомат защиты для хоста из URL"""
+    host = urllib.parse.urlsplit(url).netloc
+    breaker = _circuit_breakers.get(host)
+    if breaker is None:
+        breaker = CircuitBreaker(host, BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+        _circuit_breakers[host] = breaker
+    return breaker
+
+
+def get_circuit_breaker_states() -> dict:
+    """Состояние автоматов защиты по хостам (для мониторинга)"""
+    return {host: breaker.snapshot() for host, breaker in _circuit_breakers.items()}
+
+
+@contextlib.asynccontextmanager
+async def _guarded_request(method: str, url: str, **kwargs):
+    """
+    HTTP-запрос через общую сессию под защитой автомата хоста.
+    Если хост помечен недоступным, сразу выбрасывает CircuitOpenError.
+    Ошибками хоста считаются сетевые ошибки, таймауты и ответы 5xx/429.
+    """
+    breaker = get_circuit_breaker(url)
+    if not breaker.allow_request():
+        raise CircuitOpenError(f"сервис {breaker.name} временно недоступен")
+    recorded = False
+    try:
+        session = await get_http_session()
+        async with session.request(method, url, **kwargs) as response:
+            if response.status >= 500 or response.status == 429:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            recorded = True
+            yield response
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        # Сюда попадают и обрывы при чтении тела уже принятого ответа
+        breaker.record_failure()
+        recorded = True
+        raise
+    finally:
+        if not recorded:
+            breaker.release_probe()
+
+
+# Пул для CPU-нагруженной обработки (разбор HTML, проверки текста)
+_parse_pool = None
+
+
+def get_parse_pool():
+    """Возвращает пул обработки, создавая его при первом обращении"""
+    global _parse_pool
+    if _parse_pool is None:
+        if PARSE_POOL_KIND == "process":
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_POOL_SIZE)
+        else:
+            _parse_pool = ThreadPoolExecutor(
+                max_workers=PARSE_POOL_SIZE, thread_name_prefix="parse"
+            )
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Останавливает пул обработки (вызывать при остановке бота)"""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=True, cancel_futures=True)
+        _parse_pool = None
+
+
+async def run_in_parse_pool(func, *args, timeout: float = PARSE_TIMEOUT):
+    """Выполняет func(*args) в пуле обработки не дольше timeout секунд (с ожиданием в очереди)"""
+    if timeout <= 0:
+        raise asyncio.TimeoutError()
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(
+        loop.run_in_executor(get_parse_pool(), func, *args), timeout=timeout
+    )
+
+
+async def _extract_rambler_paragraphs(response) -> tuple:
+    """
+    Извлекает абзацы гороскопа из ответа Rambler вне event loop.
+    В режиме "thread" страница разбирается кусками по мере загрузки и чтение
+    прекращается, как только найден контейнер статьи; в режиме "process"
+    страница читается целиком и разбирается в отдельном процессе.
+    Returns:
+        tuple: (абзацы основного контейнера или None, абзацы запасного или None,
+            прочитанный HTML - для дискового HTTP-кэша)
+    """
+    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+        errors="replace"
+    )
+    if PARSE_POOL_KIND == "process":
+        chunks = [
+            decoder.decode(chunk)
+            async for chunk in response.content.iter_chunked(HTML_CHUNK_SIZE)
+        ]
+        chunks.append(decoder.decode(b"", final=True))
+        html = "".join(chunks)
+        article_paragraphs, fallback_paragraphs = await run_in_parse_pool(
+            extract_article_paragraphs, html
+        )
+        return article_paragraphs, fallback_paragraphs, html
+
+    parser = ArticleTextParser()
+    # PARSE_TIMEOUT - общий лимит на разбор всей страницы, а не на каждый кусок;
+    # время загрузки между кусками в него не входит
+    loop = asyncio.get_running_loop()
+    remaining = PARSE_TIMEOUT
+
+    async def parse_step(func, *args):
+        nonlocal remaining
+        started = loop.time()
+        try:
+            return await run_in_parse_pool(func, *args, timeout=remaining)
+        finally:
+            remaining -= loop.time() - started
+
+    # Прочитанная часть страницы: при досрочной остановке в ней уже есть
+    # вся статья, и повторный разбор из кэша даст тот же результат
+    chunks = []
+    async for chunk in response.content.iter_chunked(HTML_CHUNK_SIZE):
+        chunks.append(decoder.decode(chunk))
+        await parse_step(parser.feed, chunks[-1])
+        if parser.done:
+            break
+    else:
+        chunks.append(decoder.decode(b"", final=True))
+        await parse_step(parser.feed, chunks[-1])
+        await parse_step(parser.close)
+    return parser.article_paragraphs, parser.fallback_paragraphs, "".join(chunks)
+
 
 # --- ОСНОВНАЯ ФУНКЦИЯ ДЛЯ ПОЛУЧЕНИЯ ГОРОСКОПА ---
 async def get_daily_horoscope(
-    sign: str, birth_day: int = None, birth_month: int = None
+    sign: str,
+    birth_day: int = None,
+    birth_month: int = None,
+    force_refresh: bool = False,
 ) -> dict:
     """
     Получение детального ежедневного гороскопа с реальными астрологическими данными.
@@ -83,18 +458,90 @@ async def get_daily_horoscope(
         sign (str): Знак зодиака пользователя.
         birth_day (int, optional): День рождения пользователя. Defaults to None.
         birth_month (int, optional): Месяц рождения пользователя. Defaults to None.
+        force_refresh (bool, optional): Не читать кэши, получить прогноз заново. Defaults to False.
     """
-    # Создаем уникальный ключ для кэширования с учетом времени
-    cache_key = f"{sign}_{datetime.now().strftime('%Y-%m-%d_%H')}"
-    # Проверяем кэш
-    if cache_key in horoscope_cache:
-        return horoscope_cache[cache_key]
+    # Прогноз действует весь календарный день
+    persistent_date = datetime.now().strftime("%Y-%m-%d")
+    if not force_refresh:
+        # Проверяем кэш
+        cached = horoscope_cache.get(sign, persistent_date)
+        if cached is not None:
+            return cached
+
+        # Проверяем постоянный кэш (переживает перезапуск бота)
+        try:
+            cached = await get_cached_horoscope(sign, persistent_date)
+        except Exception as e:
+            print(f"Ошибка чтения постоянного кэша гороскопов: {e}")
+            cached = None
+        # Прогноз по умолчанию в постоянный кэш больше не пишется, но мог остаться от старых версий
+        if cached is not None and not _is_default_horoscope(cached):
+            horoscope_cache.set(sign, cached, persistent_date)
+            rendered_messages.put(sign, persistent_date, cached)
+            return cached
+
+    # Объединяем одновременные запросы одного знака в одну загрузку; принудительное
+    # обновление не присоединяется к обычной загрузке, которая может отдать кэш HTTP
+    flight_key = (sign, persistent_date, force_refresh)
+    task = _inflight_horoscopes.get(flight_key)
+    if task is not None:
+        horoscope_singleflight_stats["coalesced"] += 1
+    else:
+        horoscope_singleflight_stats["fetches"] += 1
+        task = asyncio.ensure_future(
+            _fetch_daily_horoscope(
+                sign, birth_day, birth_month, persistent_date, force_refresh
+            )
+        )
+        _inflight_horoscopes[flight_key] = task
+        task.add_done_callback(
+            lambda _task: _inflight_horoscopes.pop(flight_key, None)
+        )
+    # shield: отмена одного ожидающего не должна отменять загрузку для остальных
+    return await asyncio.shield(task)
+
+
+async def get_horoscope_message(
+    sign: str,
+    variant: str = MESSAGE_ON_DEMAND,
+    birth_day: int = None,
+    birth_month: int = None,
+) -> str:
+    """
+    Готовый текст сообщения с прогнозом знака на сегодня.
+    Args:
+        sign (str): Знак зодиака.
+        variant (str): MESSAGE_ON_DEMAND или MESSAGE_BROADCAST.
+        birth_day (int, optional): День рождения (нужен только при загрузке прогноза).
+        birth_month (int, optional): Месяц рождения.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    text = rendered_messages.get(sign, variant, today)
+    if text is None:
+        horoscope_data = await get_daily_horoscope(sign, birth_day, birth_month)
+        text = rendered_messages.get(sign, variant, today)
+        if text is None:
+            # Прогноз пришёл из кэша, заполненного до смены даты
+            text = render_horoscope_messages(sign, horoscope_data)[variant]
+    return text
 
+
+async def _fetch_daily_horoscope(
+    sign: str,
+    birth_day: int,
+    birth_month: int,
+    persistent_date: str,
+    force_refresh: bool = False,
+) -> dict:
+    """Загрузка гороскопа из источников и сохранение его в кэши"""
     # 1. Получаем информацию о планетах и их положении (на основе даты рождения!)
     planetary_info = await get_planetary_positions(birth_day, birth_month)
 
     # 2. Получаем астрологический прогноз из API (новый сервис Rambler)
-    astro_forecast = await get_astrological_forecast(sign)
+    if HEDGED_FETCH_ENABLED:
+        astro_forecast = await get_hedged_forecast(sign, force_refresh)
+    else:
+        astro_forecast = await get_astrological_forecast(sign, force_refresh)
 
     # 3. Генерируем подробный текст гороскопа (PLANET_INFLUENCES_DLAILED больше нет)
     enhanced_description = await generate_enhanced_forecast_text(
@@ -116,11 +563,41 @@ async def get_daily_horoscope(
         "lucky_time": astro_forecast.get("lucky_time", ""),
     }
 
+    # Прогноз по умолчанию (источники недоступны) держим недолго и только в памяти,
+    # чтобы после восстановления источников получить настоящий
+    if _is_default_horoscope(result):
+        horoscope_cache.set(sign, result, persistent_date, ttl=DEFAULT_FORECAST_CACHE_TTL)
+        return result
+
     # Сохраняем в кэш
-    horoscope_cache[cache_key] = result
+    horoscope_cache.set(sign, result, persistent_date)
+    rendered_messages.put(sign, persistent_date, result)
+    await _save_persistent_horoscope(sign, persistent_date, result)
     return result
 
 
+def _is_default_horoscope(horoscope_data: dict) -> bool:
+    """Гороскоп собран из прогноза по умолчанию, а не из внешнего источника"""
+    return horoscope_data.get("forecast", {}).get("source") == "default"
+
+
+async def _save_persistent_horoscope(sign: str, date: str, result: dict) -> None:
+    """Сохраняет гороскоп в постоянный кэш и раз в день удаляет старые записи"""
+    global _persistent_cache_cleanup_date
+    try:
+        await save_cached_horoscope(sign, date, result)
+        if _persistent_cache_cleanup_date != date:
+            await delete_cached_horoscopes_before(date)
+            _persistent_cache_cleanup_date = date
+    except Exception as e:
+        print(f"Ошибка записи постоянного кэша гороскопов: {e}")
+
+
+def get_singleflight_stats() -> dict:
+    """Счётчики объединения одновременных запросов гороскопа (для мониторинга)"""
+    return dict(horoscope_singleflight_stats)
+
+
 # --- КОНЕЦ ОСНОВНОЙ ФУНКЦИИ ---
 
 
@@ -138,7 +615,10 @@ async def generate_enhanced_forecast_text(
     # API теперь должен возвращать текст на русском
     if api_description and len(api_description) > 10:
         # Проверяем, что текст на русском (на всякий случай)
-        if re.search(r"[а-яА-Я]", api_description[:100]):
+        # Если перевод уже пробовали при получении прогноза, второй раз не переводим
+        if re.search(r"[а-яА-Я]", api_description[:100]) or forecast_data.get(
+            "translation_attempted"
+        ):
             forecast_text += (
                 f"✨ Астрологический прогноз для {sign}:\n{api_description}\n"
             )
@@ -182,10 +662,11 @@ async def generate_enhanced_forecast_text(
     moon_phase = planetary_info.get("moon_phase", "Неизвестно")
     mercury_retrograde = planetary_info.get("mercury_retrograde", False)
 
-    # Получаем реальные астрологические условия на сегодня
-    real_sun_sign = await get_real_sun_sign()
-    real_moon_phase = await get_real_moon_phase()
-    real_mercury_retrograde = await check_real_mercury_retrograde()
+    # Получаем реальные астрологические условия на сегодня (общие для всех знаков)
+    sky_state = await get_sky_state()
+    real_sun_sign = sky_state["sun_sign"]
+    real_moon_phase = sky_state["moon_phase"]
+    real_mercury_retrograde = sky_state["mercury_retrograde"]
 
     forecast_text += "🌌 Астрологические условия сегодня:\n"
     forecast_text += f"• ☀️ Солнце находится в знаке {real_sun_sign} (сегодня)\n"
@@ -256,7 +737,7 @@ async def get_planetary_positions(
     Если переданы birth_day и birth_month, определяет знак Солнца для даты рождения.
     """
     try:
-        current_date = datetime.now().strftime("%Y-%m-%d")
+        sky_state = await get_sky_state()
         # ИСПРАВЛЕНО: Определяем знак Солнца для даты рождения, а не для сегодняшнего дня
         sun_sign = "Неизвестно"
         if birth_day is not None and birth_month is not None:
@@ -264,10 +745,10 @@ async def get_planetary_positions(
                 birth_day, birth_month
             )  # <-- Используем правильную функцию
         planetary_data = {
-            "date": current_date,
+            "date": sky_state["date"],
             "sun_sign": sun_sign,  # <-- Теперь корректный знак
-            "moon_phase": await get_moon_phase(),
-            "mercury_retrograde": await check_mercury_retrograde(),
+            "moon_phase": sky_state["moon_phase"],
+            "mercury_retrograde": sky_state["mercury_retrograde"],
         }
         return planetary_data
     except Exception as e:
@@ -279,10 +760,10 @@ async def get_real_sun_sign() -> str:
     """Получение реального знака Солнца на сегодня в режиме реального времени"""
     try:
         current_date = datetime.now()
-        current_day = current_date.day
-        current_month = current_date.month
-        # Определяем реальный знак Солнца на сегодня
-        real_sun_sign = get_zodiac_sign(current_day, current_month)
+        # Определяем реальный знак Солнца на сегодня с учётом дат перехода этого года
+        real_sun_sign = get_zodiac_sign_for_date(
+            current_date.day, current_date.month, current_date.year
+        )
         return real_sun_sign
     except Exception as e:
         print(f"Ошибка при получении реального знака Солнца: {e}")
@@ -290,39 +771,9 @@ async def get_real_sun_sign() -> str:
 
 
 async def get_real_moon_phase() -> str:
-    """Получение реальной фазы Луны в режиме реального времени"""
+    """Получение реальной фазы Луны на сегодня по таблице фаз"""
     try:
-        # Реальная фаза Луны зависит от дня месяца
-        day_of_month = datetime.now().day
-        phases = [
-            "Новолуние",
-            "Молодая луна",
-            "Первая четверть",
-            "Прибывающая луна",
-            "Полнолуние",
-            "Убывающая луна",
-            "Последняя четверть",
-            "Старая луна",
-        ]
-        # Более точное определение фазы (примерное)
-        if day_of_month <= 3:
-            return "Новолуние"
-        elif day_of_month <= 7:
-            return "Молодая луна"
-        elif day_of_month <= 10:
-            return "Первая четверть"
-        elif day_of_month <= 14:
-            return "Прибывающая луна"
-        elif day_of_month <= 17:
-            return "Полнолуние"
-        elif day_of_month <= 21:
-            return "Убывающая луна"
-        elif day_of_month <= 24:
-            return "Последняя четверть"
-        elif day_of_month <= 28:
-            return "Старая луна"
-        else:
-            return "Новолуние"
+        return get_phase_name(datetime.now().date())
     except Exception as e:
         print(f"Ошибка при получении реальной фазы Луны: {e}")
         return "Неизвестно"
@@ -332,54 +783,10 @@ async def get_real_moon_phase() -> str:
 
 
 async def check_real_mercury_retrograde() -> bool:
-    """Проверка реального состояния Меркурия в ретроградном движении в режиме реального времени"""
+    """Проверка реального состояния Меркурия в ретроградном движении по индексу остановок"""
     try:
-        # Реальные периоды ретроградного движения Меркурия (обновлены для 2024-2025)
-        current_date = datetime.now().date()  # Получаем объект date для сравнения
-
-        # Источники: https://www.almanac.com/astronomy/mercury-retrograde
-        # https://www.timeanddate.com/astronomy/planets/mercury-retrograde.html
-        # Даты указаны как (начало_ретрограда, конец_ретрограда)
-        mercury_retrograde_dates_2024 = [
-            (datetime(2024, 1, 1).date(), datetime(2024, 1, 25).date()),
-            (datetime(2024, 5, 14).date(), datetime(2024, 6, 4).date()),
-            (datetime(2024, 9, 6).date(), datetime(2024, 9, 26).date()),
-            (
-                datetime(2024, 12, 30).date(),
-                datetime(2025, 1, 18).date(),
-            ),  # Переходит в 2025
-        ]
-
-        mercury_retrograde_dates_2025 = [
-            (datetime(2025, 4, 11).date(), datetime(2025, 5, 3).date()),
-            (datetime(2025, 8, 4).date(), datetime(2025, 8, 28).date()),
-            (
-                datetime(2025, 12, 9).date(),
-                datetime(2026, 1, 1).date(),
-            ),  # Переходит в 2026
-        ]
-
-        # Объединяем все периоды
-        all_mercury_retrograde_dates = (
-            mercury_retrograde_dates_2024 + mercury_retrograde_dates_2025
-        )
-
-        # Проверяем, попадает ли текущая дата в какой-либо из периодов
-        for start_date, end_date in all_mercury_retrograde_dates:
-            # Обрабатываем переход через Новый Год
-            if start_date.year < end_date.year:
-                # Период пересекает Новый Год (например, декабрь -> январь)
-                # Проверяем, если сегодня в этом году и после декабря, или в следующем году и до января
-                if (
-                    current_date.year == start_date.year and current_date >= start_date
-                ) or (current_date.year == end_date.year and current_date <= end_date):
-                    return True
-            else:
-                # Период в пределах одного года
-                if start_date <= current_date <= end_date:
-                    return True
-
-        return False
+        # Первое обращение строит индекс (доли секунды) - не блокируем цикл событий
+        return await asyncio.to_thread(is_retrograde, datetime.now().date())
     except Exception as e:
         print(f"Ошибка при проверке реального состояния Меркурия: {e}")
         return False
@@ -388,49 +795,6 @@ async def check_real_mercury_retrograde() -> bool:
 # ... (весь оставшийся код файла после функции check_real_mercury_retrograde) ...
 
 
-async def get_moon_phase() -> str:
-    """Получение фазы Луны"""
-    try:
-        day_of_month = datetime.now().day
-        phases = [
-            "Новолуние",
-            "Молодая луна",
-            "Первая четверть",
-            "Прибывающая луна",
-            "Полнолуние",
-            "Убывающая луна",
-            "Последняя четверть",
-            "Старая луна",
-        ]
-        phase_index = (day_of_month - 1) // 4
-        return phases[min(phase_index, len(phases) - 1)]
-    except:
-        return "Неизвестно"
-
-
-async def check_mercury_retrograde() -> bool:
-    """Проверка, находится ли Меркурий в ретроградном движении"""
-    try:
-        # Упрощенная проверка - Меркурий бывает в ретрограде примерно 3 раза в год
-        today = datetime.now()
-        retrograde_periods = [
-            (1, 10, 2, 3),  # Январь-Февраль
-            (5, 10, 6, 3),  # Май-Июнь
-            (9, 10, 10, 3),  # Сентябрь-Октябрь
-        ]
-        for start_month, start_day, end_month, duration_weeks in retrograde_periods:
-            if (
-                today.month == start_month
-                and start_day <= today.day <= start_day + duration_weeks * 7
-            ):
-                return True
-            if today.month == end_month and today.day <= duration_weeks * 7:
-                return True
-        return False
-    except:
-        return False
-
-
 def get_default_planetary_info() -> dict:
     """Получение информации по умолчанию"""
     return {
@@ -441,15 +805,44 @@ def get_default_planetary_info() -> dict:
     }
 
 
+# --- СОСТОЯНИЕ НЕБА НА ДЕНЬ ---
+# Одинаково для всех знаков и пользователей, пересчитывается при смене даты
+_sky_state = None
+
+
+async def get_sky_state() -> dict:
+    """
+    Астрологические условия на сегодня, вычисляемые один раз в день.
+    Returns:
+        dict: {"date", "sun_sign", "moon_phase", "mercury_retrograde"};
+        словарь общий, изменять его нельзя.
+    """
+    global _sky_state
+    today = datetime.now().strftime("%Y-%m-%d")
+    if _sky_state is None or _sky_state["date"] != today:
+        _sky_state = {
+            "date": today,
+            "sun_sign": await get_real_sun_sign(),
+            "moon_phase": await get_real_moon_phase(),
+            "mercury_retrograde": await check_real_mercury_retrograde(),
+        }
+    return _sky_state
+
+
 # --- НОВАЯ/ОБНОВЛЕННАЯ ФУНКЦИЯ ДЛЯ ПОЛУЧЕНИЯ ГОРОСКОПА С RAMBLER ---
 # horoscope_api.py (фрагмент обновленной функции)
 # ... (все импорты и предыдущий код остаются без изменений) ...
 
 
 # --- ОБНОВЛЕННАЯ ФУНКЦИЯ ДЛЯ ПОЛУЧЕНИЯ ГОРОСКОПА С RAMBLER ---
-async def get_astrological_forecast(sign: str) -> dict:
+async def get_astrological_forecast(
+    sign: str, force_refresh: bool = False, fallback: bool = True
+) -> dict:
     """
     Получение астрологического прогноза с rambler.ru.
+    Страница запрашивается условно (If-None-Match / If-Modified-Since), ответ 304
+    обслуживается из дискового HTTP-кэша; force_refresh запрашивает её заново.
+    При fallback=False неудача возвращает None вместо перехода к aztro.
     """
     try:
         # Получаем URL для конкретного знака
@@ -457,166 +850,118 @@ async def get_astrological_forecast(sign: str) -> dict:
 
         if not horoscope_url:
             print(f"Не найден URL для знака зодиака: {sign}")
-            return await get_alternative_forecast(
-                sign
+            return await _after_rambler_failure(
+                sign, force_refresh, fallback
             )  # Пробуем альтернативный источник сразу
 
         timeout = aiohttp.ClientTimeout(total=15)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            # Добавляем заголовки, имитирующие браузер, чтобы избежать блокировок
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Site": "none",
-                "Cache-Control": "max-age=0",
-            }
-
-            async with session.get(horoscope_url, headers=headers) as response:
-                if response.status == 200:
-                    try:
-                        html_content = await response.text()
-
-                        # --- ОБНОВЛЕННОЕ ИЗВЛЕЧЕНИЕ ТЕКСТА ГОРОСКОПА ---
-                        # Ищем контейнер с текстом гороскопа
-                        # Пример обновленной структуры: <div class="article__text"><p>...</p><p>...</p></div>
-                        # Или <div class="jLSeW"><p>...</p><p>...</p></div> (как в примере сниппета)
-
-                        # Пробуем сначала найти div с классом, содержащим "article__text"
-                        pattern_main = (
-                            r'<div[^>]*class="[^"]*article__text[^"]*"[^>]*>(.*?)</div>'
+        # Добавляем заголовки, имитирующие браузер, чтобы избежать блокировок
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Site": "none",
+            "Cache-Control": "max-age=0",
+        }
+        cached_entry = None if force_refresh else await http_cache.load(horoscope_url)
+        headers.update(http_cache.conditional_headers(cached_entry))
+
+        async with _guarded_request(
+            "GET", horoscope_url, headers=headers, timeout=timeout
+        ) as response:
+            if response.status == 200 or (
+                response.status == 304 and cached_entry is not None
+            ):
+                try:
+                    # --- ПОТОКОВОЕ ИЗВЛЕЧЕНИЕ ТЕКСТА ГОРОСКОПА ---
+                    # Разбор идёт в пуле обработки, чтобы не блокировать event loop
+                    if response.status == 304:
+                        print(f"Страница Rambler для {sign} не изменилась, берём её из HTTP-кэша")
+                        article_paragraphs, fallback_paragraphs = await run_in_parse_pool(
+                            extract_article_paragraphs, cached_entry["body"]
                         )
-                        match_main = re.search(
-                            pattern_main, html_content, re.DOTALL | re.IGNORECASE
+                    else:
+                        article_paragraphs, fallback_paragraphs, html = (
+                            await _extract_rambler_paragraphs(response)
+                        )
+                        await http_cache.store(
+                            horoscope_url,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                            html,
                         )
 
-                        description_parts = []
-                        inner_html_to_parse = ""
-
-                        if match_main:
-                            inner_html_to_parse = match_main.group(1)
-                        else:
-                            # Если не найден основной класс, пробуем альтернативный подход
-                            # Ищем div, который содержит абзацы с гороскопом (менее точно, но может помочь)
-                            # Пример: найти первый div, содержащий несколько <p> с содержимым
-                            print(
-                                "Основной паттерн 'article__text' не найден, пробуем альтернативный поиск..."
-                            )
-                            # Поиск всех div и проверка содержимого
-                            divs = re.findall(
-                                r"<div[^>]*>(.*?)</div>",
-                                html_content,
-                                re.DOTALL | re.IGNORECASE,
-                            )
-                            for div_content in divs:
-                                # Проверяем, содержит ли div несколько <p> с текстом
-                                p_tags = re.findall(
-                                    r"<p[^>]*>(.*?)</p>",
-                                    div_content,
-                                    re.DOTALL | re.IGNORECASE,
-                                )
-                                # Фильтруем непустые абзацы
-                                non_empty_ps = [
-                                    p
-                                    for p in p_tags
-                                    if p.strip() and not re.match(r"^\s*<[^>]+>\s*$", p)
-                                ]
-                                if (
-                                    len(non_empty_ps) >= 1
-                                ):  # Если найден хотя бы один непустой абзац
-                                    # Более точная проверка: ищем div, который выглядит как текст гороскопа
-                                    # (например, не содержит вложенных сложных структур в большом количестве)
-                                    if (
-                                        div_content.count("<div") < 5
-                                        and div_content.count("<script") == 0
-                                    ):
-                                        inner_html_to_parse = div_content
-                                        print(
-                                            "Найден потенциальный контейнер для текста гороскопа (альтернативный метод)."
-                                        )
-                                        break  # Берем первый подходящий
-
-                        # Если нашли HTML для парсинга
-                        if inner_html_to_parse:
-                            # Извлекаем все <p> теги
-                            p_texts = re.findall(
-                                r"<p[^>]*>(.*?)</p>",
-                                inner_html_to_parse,
-                                re.DOTALL | re.IGNORECASE,
-                            )
-
-                            for p_text in p_texts:
-                                # Очищаем HTML теги из текста абзаца
-                                clean_text = re.sub(r"<[^>]+>", "", p_text).strip()
-                                # Декодируем HTML сущности (например, &mdash;, &nbsp;, &laquo;, &raquo;)
-                                clean_text = re.sub(r"&mdash;", "—", clean_text)
-                                clean_text = re.sub(r"&nbsp;", " ", clean_text)
-                                clean_text = re.sub(r"&laquo;", '"', clean_text)
-                                clean_text = re.sub(r"&raquo;", '"', clean_text)
-                                clean_text = re.sub(r"&quot;", '"', clean_text)
-                                clean_text = re.sub(
-                                    r"&amp;", "&", clean_text
-                                )  # Важно делать последним
-                                # Добавляем непустой текст
-                                if clean_text:
-                                    description_parts.append(clean_text)
-
-                        description = " ".join(description_parts).strip()
-
-                        if (
-                            description and len(description) > 20
-                        ):  # Проверка на минимальную длину
-                            print(
-                                f"Гороскоп для {sign} успешно получен и обработан с rambler.ru"
-                            )
-                            # Rambler предоставляет гороскоп на русском, перевод не нужен
-                            return {
-                                "description": description,
-                                "compatibility": "См. общий прогноз",
-                                "mood": "См. общий прогноз",
-                                "color": "См. общий прогноз",
-                                "lucky_number": "См. общий прогноз",
-                                "lucky_time": "См. общий прогноз",
-                                "date_range": "Сегодня",
-                            }
-                        else:
+                    if article_paragraphs is None:
+                        print(
+                            "Основной контейнер 'article__text' не найден, используем альтернативный поиск..."
+                        )
+                        if fallback_paragraphs:
                             print(
-                                f"Не удалось извлечь подходящий текст гороскопа из HTML для {sign}. Извлечено: '{description[:50]}...'"
+                                "Найден потенциальный контейнер для текста гороскопа (альтернативный метод)."
                             )
+                    description_parts = article_paragraphs or fallback_paragraphs or []
 
-                        # --- КОНЕЦ ОБНОВЛЕННОГО ИЗВЛЕЧЕНИЯ ---
+                    description = " ".join(description_parts).strip()
 
-                        # Если извлечение не удалось
+                    if (
+                        description and len(description) > 20
+                    ):  # Проверка на минимальную длину
+                        print(
+                            f"Гороскоп для {sign} успешно получен и обработан с rambler.ru"
+                        )
+                        # Rambler предоставляет гороскоп на русском, перевод не нужен
+                        return {
+                            "description": description,
+                            "compatibility": "См. общий прогноз",
+                            "mood": "См. общий прогноз",
+                            "color": "См. общий прогноз",
+                            "lucky_number": "См. общий прогноз",
+                            "lucky_time": "См. общий прогноз",
+                            "date_range": "Сегодня",
+                            "source": "rambler",
+                        }
+                    else:
                         print(
-                            f"Не удалось найти или корректно извлечь текст гороскопа для {sign} с rambler.ru."
+                            f"Не удалось извлечь подходящий текст гороскопа из HTML для {sign}. Извлечено: '{description[:50]}...'"
                         )
-                        # Пробуем альтернативный источник
-                        return await get_alternative_forecast(sign)
 
-                    except Exception as parse_error:
-                        print(f"Ошибка парсинга HTML для {sign}: {parse_error}")
-                        import traceback
+                    # --- КОНЕЦ ПОТОКОВОГО ИЗВЛЕЧЕНИЯ ---
 
-                        traceback.print_exc()  # Для отладки
-                        # Пробуем альтернативный источник
-                        return await get_alternative_forecast(sign)
-                else:
-                    error_text = await response.text()
+                    # Если извлечение не удалось
                     print(
-                        f"Rambler вернул статус {response.status} для знака {sign}. Заголовки: {response.headers}"
+                        f"Не удалось найти или корректно извлечь текст гороскопа для {sign} с rambler.ru."
                     )
                     # Пробуем альтернативный источник
-                    return await get_alternative_forecast(sign)
+                    return await _after_rambler_failure(sign, force_refresh, fallback)
+
+                except Exception as parse_error:
+                    print(f"Ошибка парсинга HTML для {sign}: {parse_error}")
+                    import traceback
+
+                    traceback.print_exc()  # Для отладки
+                    # Пробуем альтернативный источник
+                    return await _after_rambler_failure(sign, force_refresh, fallback)
+            else:
+                error_text = await response.text()
+                print(
+                    f"Rambler вернул статус {response.status} для знака {sign}. Заголовки: {response.headers}"
+                )
+                # Пробуем альтернативный источник
+                return await _after_rambler_failure(sign, force_refresh, fallback)
 
+    except CircuitOpenError as circuit_error:
+        print(f"Rambler пропущен для {sign}: {circuit_error}")
+        # Пробуем альтернативный источник
+        return await _after_rambler_failure(sign, force_refresh, fallback)
     except aiohttp.ClientError as client_error:
         print(f"Сетевая ошибка при запросе к Rambler для {sign}: {client_error}")
         # Пробуем альтернативный источник
-        return await get_alternative_forecast(sign)
+        return await _after_rambler_failure(sign, force_refresh, fallback)
     except Exception as e:
         print(
             f"Неожиданная ошибка при получении астрологического прогноза для {sign} с Rambler: {e}"
@@ -625,96 +970,180 @@ async def get_astrological_forecast(sign: str) -> dict:
 
         traceback.print_exc()  # Для отладки
         # Пробуем альтернативный источник
-        return await get_alternative_forecast(sign)
+        return await _after_rambler_failure(sign, force_refresh, fallback)
 
 
 # ... (остальной код файла остается без изменений) ...
 
 
 # --- ОБНОВЛЕННАЯ ФУНКЦИЯ ДЛЯ АЛЬТЕРНАТИВНОГО ИСТОЧНИКА (фолбэк на aztro) ---
-async def get_alternative_forecast(sign: str) -> dict:
-    """Получение прогноза из альтернативного источника (оригинальный aztro API с переводом)."""
+async def _after_rambler_failure(sign: str, force_refresh: bool, fallback: bool):
+    """Переход к aztro после неудачи с Rambler (или None, если переход отключён)"""
+    if not fallback:
+        return None
+    return await get_alternative_forecast(sign, force_refresh)
+
+
+async def get_alternative_forecast(
+    sign: str, force_refresh: bool = False, fallback: bool = True, translate: bool = True
+) -> dict:
+    """
+    Получение прогноза из альтернативного источника (оригинальный aztro API с переводом).
+    Параметры против кэширования добавляются только при force_refresh.
+    При fallback=False неудача возвращает None вместо прогноза по умолчанию;
+    при translate=False описание возвращается без перевода.
+    """
     print(
         f"Попытка получить прогноз для {sign} из альтернативного источника (aztro)..."
     )
     try:
         sign_api = ZODIAC_API_MAP.get(sign, "aries")
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        current_time = datetime.now().strftime("%H:%M:%S")
-        # Создаем уникальные параметры для предотвращения кэширования
-        unique_param = hashlib.md5(
-            f"{sign_api}_{current_date}_{current_time}".encode()
-        ).hexdigest()[:12]
 
         timeout = aiohttp.ClientTimeout(total=15)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            # Предполагается, что ASTRO_API_BASE = "https://aztro.sameerkumar.website"
-            url = f"{ASTRO_API_BASE}"
-            params = {
-                "sign": sign_api,
-                "day": "today",
-                "_": unique_param,
-                "t": current_time,
-            }
-            # Добавляем заголовки для лучшей идентификации
-            headers = {
-                "User-Agent": "AstroBot/1.0",
-                "Cache-Control": "no-cache",
-                "Accept": "application/json",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
-            }
-            async with session.post(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    try:
-                        data = await response.json()
-                        description = data.get("description", "")
-                        # Переводим при необходимости (оригинальная логика)
-                        if description and not re.search(
-                            r"[а-яА-Я]", description[:100]
-                        ):
-                            translated_description = await translate_text(description)
-                            if (
-                                translated_description
-                                and len(translated_description.strip()) > 10
-                            ):
-                                if re.search(r"[а-яА-Я]", translated_description[:100]):
-                                    description = translated_description.strip()
-                                else:
-                                    print(
-                                        f"Предупреждение: Перевод для {sign} не содержит кириллицы"
-                                    )
-                            else:
-                                print(
-                                    f"Предупреждение: Не удалось перевести текст для {sign}"
-                                )
-                        print(
-                            f"Прогноз для {sign} получен из альтернативного источника (aztro)."
-                        )
-                        return {
-                            "description": description,
-                            "compatibility": data.get("compatibility", ""),
-                            "mood": data.get("mood", ""),
-                            "color": data.get("color", ""),
-                            "lucky_number": data.get("lucky_number", ""),
-                            "lucky_time": data.get("lucky_time", ""),
-                            "date_range": data.get("date_range", ""),
-                        }
-                    except Exception as json_error:
-                        print(
-                            f"Ошибка парсинга JSON из альтернативного источника (aztro) для {sign}: {json_error}"
-                        )
-                        return get_default_forecast(sign)
-                else:
+        # Предполагается, что ASTRO_API_BASE = "https://aztro.sameerkumar.website"
+        url = f"{ASTRO_API_BASE}"
+        params = {
+            "sign": sign_api,
+            "day": "today",
+        }
+        # Добавляем заголовки для лучшей идентификации
+        headers = {
+            "User-Agent": "AstroBot/1.0",
+            "Accept": "application/json",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept-Language": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+        }
+        # aztro принимает только POST: условные заголовки для него не шлём
+        # (If-None-Match на POST означает 412, а не 304), ответ не кэшируем
+        if force_refresh:
+            current_date = datetime.now().strftime("%Y-%m-%d")
+            current_time = datetime.now().strftime("%H:%M:%S")
+            # Создаем уникальные параметры для предотвращения кэширования
+            unique_param = hashlib.md5(
+                f"{sign_api}_{current_date}_{current_time}".encode()
+            ).hexdigest()[:12]
+            params["_"] = unique_param
+            params["t"] = current_time
+            headers["Cache-Control"] = "no-cache"
+        async with _guarded_request(
+            "POST", url, params=params, headers=headers, timeout=timeout
+        ) as response:
+            if response.status == 200:
+                try:
+                    data = await response.json()
+                    description = data.get("description", "")
+                    if translate:
+                        description = await _translate_description(sign, description)
                     print(
-                        f"Альтернативный источник (aztro) вернул статус {response.status} для знака {sign}"
+                        f"Прогноз для {sign} получен из альтернативного источника (aztro)."
                     )
-                    return get_default_forecast(sign)
+                    return {
+                        "description": description,
+                        "compatibility": data.get("compatibility", ""),
+                        "mood": data.get("mood", ""),
+                        "color": data.get("color", ""),
+                        "lucky_number": data.get("lucky_number", ""),
+                        "lucky_time": data.get("lucky_time", ""),
+                        "date_range": data.get("date_range", ""),
+                        "source": "aztro",
+                        "translation_attempted": translate,
+                    }
+                except Exception as json_error:
+                    print(
+                        f"Ошибка парсинга JSON из альтернативного источника (aztro) для {sign}: {json_error}"
+                    )
+                    return get_default_forecast(sign) if fallback else None
+            else:
+                print(
+                    f"Альтернативный источник (aztro) вернул статус {response.status} для знака {sign}"
+                )
+                return get_default_forecast(sign) if fallback else None
     except Exception as e:
         print(
             f"Ошибка при получении астрологического прогноза для {sign} из альтернативного источника (aztro): {e}"
         )
+        return get_default_forecast(sign) if fallback else None
+
+
+async def _translate_description(sign: str, description: str) -> str:
+    """Перевод описания прогноза aztro на русский (оригинальная логика)"""
+    if description and not re.search(r"[а-яА-Я]", description[:100]):
+        translated_description = await translate_text(description)
+        if translated_description and len(translated_description.strip()) > 10:
+            if re.search(r"[а-яА-Я]", translated_description[:100]):
+                return translated_description.strip()
+            print(f"Предупреждение: Перевод для {sign} не содержит кириллицы")
+        else:
+            print(f"Предупреждение: Не удалось перевести текст для {sign}")
+    return description
+
+
+async def get_hedged_forecast(sign: str, force_refresh: bool = False) -> dict:
+    """
+    Хеджированное получение прогноза: Rambler запускается сразу, aztro - если
+    Rambler не ответил за HEDGE_DELAY секунд или уже вернул ошибку. Побеждает
+    первый корректный ответ, остальные запросы отменяются. Через
+    FORECAST_DEADLINE секунд возвращается прогноз по умолчанию. Ответ aztro
+    переводится после гонки в пределах оставшегося до FORECAST_DEADLINE времени.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    hedge_at = started + HEDGE_DELAY
+    deadline = started + FORECAST_DEADLINE
+    primary = asyncio.ensure_future(
+        get_astrological_forecast(sign, force_refresh, fallback=False)
+    )
+    secondary = None
+    winner = None
+    pending = {primary}
+    try:
+        while pending:
+            now = loop.time()
+            if now >= deadline:
+                break
+            # Пока запасной источник не запущен, ждём не дольше задержки хеджирования
+            wait_until = deadline if secondary is not None else min(deadline, hedge_at)
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, wait_until - now),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                result = None if task.exception() else task.result()
+                if result and result.get("description"):
+                    if task is secondary:
+                        print(f"Хеджирование: для {sign} первым ответил запасной источник (aztro)")
+                        winner = result
+                        break
+                    return result
+            if winner is not None:
+                break
+            # Основной источник молчит дольше задержки или уже завершился неудачей
+            if secondary is None:
+                secondary = asyncio.ensure_future(
+                    get_alternative_forecast(
+                        sign, force_refresh, fallback=False, translate=False
+                    )
+                )
+                pending.add(secondary)
+        if winner is None:
+            print(f"Хеджирование: не удалось получить прогноз для {sign} ни из одного источника")
+    finally:
+        for task in (primary, secondary):
+            if task is not None and not task.done():
+                task.cancel()
+    if winner is None:
         return get_default_forecast(sign)
+    try:
+        winner["description"] = await asyncio.wait_for(
+            _translate_description(sign, winner["description"]),
+            timeout=max(0.0, deadline - loop.time()),
+        )
+    except asyncio.TimeoutError:
+        print(f"Хеджирование: перевод прогноза для {sign} не уложился в FORECAST_DEADLINE")
+    # Повторно переводить в generate_enhanced_forecast_text не нужно
+    winner["translation_attempted"] = True
+    return winner
 
 
 def get_default_forecast(sign: str) -> dict:
@@ -729,12 +1158,93 @@ def get_default_forecast(sign: str) -> dict:
         "lucky_number": str(random.randint(1, 100)),
         "lucky_time": f"{random.randint(9, 20)}:{random.choice(['00', '15', '30', '45'])}",
         "date_range": "Сегодня",
+        "source": "default",
     }
 
 
 # --- КОНЕЦ ФУНКЦИЙ ДЛЯ ПОЛУЧЕНИЯ АСТРОЛОГИЧЕСКОЙ ИНФОРМАЦИИ ---
 
 
+# --- РАСЧЁТ НАТАЛЬНОЙ КАРТЫ ---
+class NatalChartCache:
+    """LRU-кэш рассчитанных карт в памяти, ключ - (дата, время, место)"""
+
+    def __init__(self, max_size: int = NATAL_CHART_CACHE_SIZE):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        chart = self._data.get(key)
+        if chart is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return chart
+
+    def set(self, key: tuple, chart: dict) -> None:
+        self._data[key] = chart
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+natal_chart_cache = NatalChartCache()
+
+
+async def get_natal_chart(
+    birth_date: str, birth_time: str = None, birth_place: str = None
+):
+    """
+    Натальная карта, рассчитанная локально (см. natal_chart.compute_natal_chart).
+    Одинаковые дата, время и место рождения рассчитываются один раз: карта
+    ищется в памяти, затем в БД.
+    Returns:
+        dict | None: карта или None при неверной дате рождения
+    """
+    try:
+        day, month, year = map(int, birth_date.split("."))
+    except (AttributeError, ValueError):
+        return None
+    time_of_birth = parse_birth_time(birth_time)
+    place, latitude, longitude, time_zone, _ = resolve_place(birth_place)
+    time_key = f"{time_of_birth[0]:02d}:{time_of_birth[1]:02d}" if time_of_birth else ""
+    key = (f"{day:02d}.{month:02d}.{year}", time_key, place)
+
+    chart = natal_chart_cache.get(key)
+    if chart is not None:
+        return chart
+    try:
+        chart = await get_cached_natal_chart(*key)
+    except Exception as e:
+        print(f"Ошибка чтения кэша натальных карт: {e}")
+        chart = None
+    if chart is None:
+        try:
+            chart = compute_natal_chart(
+                day, month, year, time_of_birth, latitude, longitude, time_zone
+            )
+        except ValueError:
+            return None
+        try:
+            await save_cached_natal_chart(*key, chart)
+        except Exception as e:
+            print(f"Ошибка записи кэша натальных карт: {e}")
+    natal_chart_cache.set(key, chart)
+    return chart
+
+
+def get_natal_chart_cache_stats() -> dict:
+    """Статистика кэша натальных карт (для мониторинга)"""
+    return natal_chart_cache.stats()
+# --- КОНЕЦ РАСЧЁТА НАТАЛЬНОЙ КАРТЫ ---
+
+
 # --- ФУНКЦИИ ДЛЯ ГЕНЕРАЦИИ ССЫЛКИ НА НАТАЛЬНУЮ КАРТУ ---
 async def get_natal_chart_info(
     birth_date: str, birth_time: str = None, birth_place: str = None
@@ -751,11 +1261,20 @@ async def get_natal_chart_info(
     if birth_time and birth_time != "-":
         info_lines.append(f"⏰ Время рождения: {birth_time}")
     else:
-        info_lines.append("⏰ Время рождения: 00:00 (по умолчанию)")
+        info_lines.append("⏰ Время рождения: 12:00 (по умолчанию)")
     if birth_place and birth_place != "-":
         info_lines.append(f"📍 Место рождения: {birth_place}")
     else:
         info_lines.append("📍 Место рождения: Краснодар (по умолчанию)")
+    # Положения планет, асцендент и дома, рассчитанные локально
+    chart = await get_natal_chart(birth_date, birth_time, birth_place)
+    if chart is not None:
+        info_lines.append("")
+        if birth_place and birth_place != "-" and not resolve_place(birth_place)[4]:
+            info_lines.append("⚠️ Город не найден в справочнике, расчёт выполнен для Краснодара")
+        if chart["houses"] is None:
+            info_lines.append("⚠️ Без времени рождения положения даны на 12:00, асцендент и дома не рассчитываются")
+        info_lines.extend(format_natal_chart(chart))
     info_lines.append("")  # Пустая строка перед советами
     info_lines.append("💡 Советы:")
     info_lines.append("• Для точного расчета укажите точное время рождения")
@@ -764,14 +1283,15 @@ async def get_natal_chart_info(
     info_lines.append(
         "• ДЛЯ БОЛЕЕ ТОЧНОГО ПОНИМАНИЯ СВОЕГО ДАЛЬНЕЙШЕГО ПУТИ ОБРАТИТЕСЬ К НАШИМ СПЕЦИАЛИСТАМ @Eva_evgenivna99"
     )
-    return {"info_text": "\n".join(info_lines), "url": natal_chart_url}
+    return {"info_text": "\n".join(info_lines), "url": natal_chart_url, "chart": chart}
 
 
 def generate_astro_seek_url(
     day: str, month: str, year: str, birth_time: str = None, birth_place: str = None
 ) -> str:
     """Генерация URL для astro-seek.com по образцу из запроса пользователя"""
-    hour = "00"
+    # Без времени рождения - полдень, как в локальном расчёте карты
+    hour = "12"
     minute = "00"
     city_display_name = "Краснодар"
     city_url_name = "Краснодар"
@@ -848,8 +1368,8 @@ def generate_astro_seek_url(
 # Функция для очистки кэша (вызывать при необходимости)
 def clear_horoscope_cache():
     """Очистка кэша гороскопов"""
-    global horoscope_cache
-    horoscope_cache.clear()
+    horoscope_cache.invalidate()
+    rendered_messages.invalidate()
     print("Кэш гороскопов очищен")
 
 
@@ -858,15 +1378,59 @@ async def get_fresh_horoscope(
     sign: str, birth_day: int = None, birth_month: int = None
 ) -> dict:
     """Получение свежего гороскопа без использования кэша"""
-    # Временно очищаем кэш для этого знака
-    cache_key = f"{sign}_{datetime.now().strftime('%Y-%m-%d_%H')}"
-    if cache_key in horoscope_cache:
-        del horoscope_cache[cache_key]
-    # Получаем новый прогноз
-    return await get_daily_horoscope(sign, birth_day, birth_month)
+    # Сбрасываем прогноз знака в памяти и получаем новый, минуя кэши
+    horoscope_cache.invalidate(sign)
+    rendered_messages.invalidate(sign)
+    return await get_daily_horoscope(sign, birth_day, birth_month, force_refresh=True)
 
 
 # --- ФУНКЦИИ ПЕРЕВОДА ТЕКСТА ---
+class TranslationCache:
+    """LRU-кэш переводов в памяти, ограниченный суммарной длиной переводов"""
+
+    def __init__(self, max_chars: int = TRANSLATION_CACHE_MAX_CHARS):
+        self.max_chars = max_chars
+        self._data = OrderedDict()  # ключ -> перевод
+        self._chars = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        translated = self._data.get(key)
+        if translated is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return translated
+
+    def set(self, key: str, translated: str) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._chars -= len(old)
+        self._data[key] = translated
+        self._chars += len(translated)
+        while self._chars > self.max_chars and len(self._data) > 1:
+            _, evicted = self._data.popitem(last=False)
+            self._chars -= len(evicted)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "chars": self._chars,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+translation_cache = TranslationCache()
+
+
+def translation_cache_key(text: str, source: str = "en", target: str = "ru") -> str:
+    """Ключ кэша переводов: хэш языковой пары и исходного текста"""
+    return hashlib.sha256(f"{source}|{target}|{text}".encode("utf-8")).hexdigest()
+
+
 # (Функции перевода оставлены без изменений, так как могут потребоваться как фолбэк)
 async def translate_text(text: str) -> str:
     """Перевод текста с помощью различных онлайн-переводчиков"""
@@ -875,50 +1439,149 @@ async def translate_text(text: str) -> str:
     # Проверяем, если текст уже на целевом языке (проверяем первые 100 символов)
     if re.search(r"[а-яА-Я]", text[:100]):
         return text
-    # Пробуем различные методы перевода
+    # Сначала кэш в памяти, затем постоянный кэш в БД
+    cache_key = translation_cache_key(text)
+    cached = translation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    try:
+        cached = await get_cached_translation(cache_key)
+    except Exception as e:
+        print(f"Ошибка чтения кэша переводов: {e}")
+        cached = None
+    if cached is not None:
+        translation_cache.set(cache_key, cached)
+        return cached
+    methods = _ordered_translators()
+    if TRANSLATION_RACE_ENABLED:
+        winner = await _race_translators(text, methods)
+        if winner:
+            method, translated = winner
+            await _remember_translation(cache_key, translated)
+            return translated
+    else:
+        for method in methods:
+            try:
+                translated = (await method(text) or "").strip()
+                if await is_good_translation(translated):
+                    _translator_wins[method.__name__] += 1
+                    await _remember_translation(cache_key, translated)
+                    return translated
+                if translated:
+                    print(
+                        f"Предупреждение: {method.__name__} вернул перевод низкого качества"
+                    )
+            except Exception as e:
+                print(f"Ошибка перевода через {method.__name__}: {e}")
+                continue
+    # Если все методы не сработали, возвращаем оригинальный текст
+    print(f"Предупреждение: Не удалось перевести текст, возвращаем оригинальный")
+    return text
+
+
+# Сколько раз каждый переводчик дал принятый перевод; определяет порядок запуска
+_translator_wins = Counter()
+
+
+def _ordered_translators() -> list:
+    """Переводчики в порядке убывания числа побед (при равенстве - исходный порядок)"""
     methods = [
         translate_with_google_api,
         translate_with_yandex_api,
         translate_with_mymemory_api,
         translate_with_libretranslate_api,
     ]
-    for method in methods:
-        try:
-            translated = await method(text)
-            if translated and len(translated.strip()) > 5:
-                # Проверяем, содержит ли перевод русские буквы
-                if re.search(r"[а-яА-Я]", translated[:100]):
-                    return translated.strip()
+    return sorted(methods, key=lambda m: -_translator_wins[m.__name__])
+
+
+def get_translator_stats() -> dict:
+    """Число принятых переводов по каждому переводчику"""
+    return dict(_translator_wins)
+
+
+async def _race_translators(text: str, methods: list):
+    """
+    Гонка переводчиков: очередной запускается через TRANSLATION_RACE_STAGGER
+    секунд или сразу, если предыдущий завершился неудачей. Побеждает первый
+    перевод, прошедший is_good_translation; остальные запросы отменяются.
+    Returns:
+        tuple | None: (победивший метод, перевод) или None, если за
+        TRANSLATION_DEADLINE секунд ни один перевод не подошёл.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + TRANSLATION_DEADLINE
+    queue = list(methods)
+    running = {}  # задача -> метод
+    next_start = loop.time()
+    try:
+        while queue or running:
+            now = loop.time()
+            if now >= deadline:
+                print("Предупреждение: переводчики не уложились в лимит времени")
+                break
+            if queue and (now >= next_start or not running):
+                method = queue.pop(0)
+                running[asyncio.ensure_future(method(text))] = method
+                next_start = now + TRANSLATION_RACE_STAGGER
+            # Пока есть не запущенные переводчики, ждём не дольше шага запуска
+            wait_until = min(deadline, next_start) if queue else deadline
+            done, _ = await asyncio.wait(
+                running,
+                timeout=max(0.0, wait_until - now),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                method = running.pop(task)
+                if task.exception():
+                    print(f"Ошибка перевода через {method.__name__}: {task.exception()}")
+                    translated = ""
                 else:
+                    translated = (task.result() or "").strip()
+                if await is_good_translation(translated):
+                    _translator_wins[method.__name__] += 1
+                    return method, translated
+                if translated:
                     print(
-                        f"Предупреждение: {method.__name__} вернул текст без кириллицы"
+                        f"Предупреждение: {method.__name__} вернул перевод низкого качества"
                     )
-        except Exception as e:
-            print(f"Ошибка перевода через {method.__name__}: {e}")
-            continue
-    # Если все методы не сработали, возвращаем оригинальный текст
-    print(f"Предупреждение: Не удалось перевести текст, возвращаем оригинальный")
-    return text
+                # Неудача - следующий переводчик запускается без ожидания
+                next_start = loop.time()
+    finally:
+        for task in running:
+            task.cancel()
+    return None
+
+
+async def _remember_translation(cache_key: str, translated: str) -> None:
+    """Сохраняет удачный перевод в оба уровня кэша"""
+    translation_cache.set(cache_key, translated)
+    try:
+        await save_cached_translation(
+            cache_key, translated, TRANSLATION_CACHE_MAX_ROWS
+        )
+    except Exception as e:
+        print(f"Ошибка записи кэша переводов: {e}")
 
 
 async def translate_with_google_api(text: str) -> str:
     """Перевод через Google Translate API"""
     try:
         timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            # Используем бесплатный Google Translate API
-            url = "https://translate.googleapis.com/translate_a/single"
-            params = {"client": "gtx", "sl": "en", "tl": "ru", "dt": "t", "q": text}
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data and len(data) > 0 and data[0]:
-                        translated_text = ""
-                        for item in data[0]:
-                            if item and len(item) > 0 and item[0]:
-                                translated_text += item[0]
-                        if translated_text and len(translated_text.strip()) > 5:
-                            return translated_text.strip()
+        # Используем бесплатный Google Translate API
+        url = "https://translate.googleapis.com/translate_a/single"
+        params = {"client": "gtx", "sl": "en", "tl": "ru", "dt": "t", "q": text}
+        async with _guarded_request(
+            "GET", url, params=params, timeout=timeout
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                if data and len(data) > 0 and data[0]:
+                    translated_text = ""
+                    for item in data[0]:
+                        if item and len(item) > 0 and item[0]:
+                            translated_text += item[0]
+                    if translated_text and len(translated_text.strip()) > 5:
+                        return translated_text.strip()
     except Exception as e:
         print(f"Ошибка Google Translate: {e}")
     return ""
@@ -928,22 +1591,23 @@ async def translate_with_yandex_api(text: str) -> str:
     """Перевод через Yandex Translate API"""
     try:
         timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            # Используем Yandex Translate через прокси
-            url = "https://translate.yandex.net/api/v1/tr.json/translate"
-            params = {
-                "lang": "en-ru",
-                "text": text,
-                "srv": "tr-text",
-                "id": f"{hashlib.md5(str(datetime.now().timestamp()).encode()).hexdigest()[:12]}-0-0",
-            }
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if "text" in data and data["text"]:
-                        translated_text = data["text"][0]
-                        if len(translated_text.strip()) > 5:
-                            return translated_text.strip()
+        # Используем Yandex Translate через прокси
+        url = "https://translate.yandex.net/api/v1/tr.json/translate"
+        params = {
+            "lang": "en-ru",
+            "text": text,
+            "srv": "tr-text",
+            "id": f"{hashlib.md5(str(datetime.now().timestamp()).encode()).hexdigest()[:12]}-0-0",
+        }
+        async with _guarded_request(
+            "GET", url, params=params, timeout=timeout
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                if "text" in data and data["text"]:
+                    translated_text = data["text"][0]
+                    if len(translated_text.strip()) > 5:
+                        return translated_text.strip()
     except Exception as e:
         print(f"Ошибка Yandex Translate: {e}")
     return ""
@@ -953,19 +1617,20 @@ async def translate_with_mymemory_api(text: str) -> str:
     """Перевод через MyMemory API"""
     try:
         timeout = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            url = "https://api.mymemory.translated.net/get"
-            params = {"q": text, "langpair": "en|ru"}
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if (
-                        "responseData" in data
-                        and "translatedText" in data["responseData"]
-                    ):
-                        translated_text = data["responseData"]["translatedText"]
-                        if len(translated_text.strip()) > 5:
-                            return translated_text.strip()
+        url = "https://api.mymemory.translated.net/get"
+        params = {"q": text, "langpair": "en|ru"}
+        async with _guarded_request(
+            "GET", url, params=params, timeout=timeout
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                if (
+                    "responseData" in data
+                    and "translatedText" in data["responseData"]
+                ):
+                    translated_text = data["responseData"]["translatedText"]
+                    if len(translated_text.strip()) > 5:
+                        return translated_text.strip()
     except Exception as e:
         print(f"Ошибка MyMemory Translate: {e}")
     return ""
@@ -983,20 +1648,21 @@ async def translate_with_libretranslate_api(text: str) -> str:
         for server in servers:
             try:
                 timeout = aiohttp.ClientTimeout(total=10)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    payload = {
-                        "q": text,
-                        "source": "en",
-                        "target": "ru",
-                        "format": "text",
-                    }
-                    async with session.post(server, json=payload) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if "translatedText" in data:
-                                translated_text = data["translatedText"]
-                                if len(translated_text.strip()) > 5:
-                                    return translated_text.strip()
+                payload = {
+                    "q": text,
+                    "source": "en",
+                    "target": "ru",
+                    "format": "text",
+                }
+                async with _guarded_request(
+                    "POST", server, json=payload, timeout=timeout
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        if "translatedText" in data:
+                            translated_text = data["translatedText"]
+                            if len(translated_text.strip()) > 5:
+                                return translated_text.strip()
             except Exception as e:
                 print(f"Ошибка LibreTranslate ({server}): {e}")
                 continue
@@ -1068,7 +1734,18 @@ async def test_translation(text: str) -> str:
 
 # --- ФУНКЦИИ ПРОВЕРКИ КАЧЕСТВА ПЕРЕВОДА ---
 async def is_good_translation(text: str) -> bool:
-    """Проверка качества перевода"""
+    """Проверка качества перевода (выполняется в пуле обработки)"""
+    if not text or len(text.strip()) < 10:
+        return False
+    try:
+        return await run_in_parse_pool(_is_good_translation_sync, text)
+    except asyncio.TimeoutError:
+        print("Предупреждение: проверка качества перевода превысила лимит времени")
+        return False
+
+
+def _is_good_translation_sync(text: str) -> bool:
+    """Проверки качества перевода: регулярные выражения по всему тексту"""
     if not text or len(text.strip()) < 10:
         return False
     # Проверяем наличие русских букв
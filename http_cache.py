@@ -0,0 +1,77 @@
+# http_cache.py
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+try:
+    from config import HTTP_CACHE_DIR
+except ImportError:
+    HTTP_CACHE_DIR = "http_cache"
+
+
+def _entry_path(key: str) -> str:
+    """Путь к файлу записи: имя - хэш ключа (URL и параметры запроса)"""
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, f"{digest}.json")
+
+
+def _read_entry(key: str):
+    try:
+        with open(_entry_path(key), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Защита от коллизии имён файлов
+    return entry if entry.get("key") == key else None
+
+
+def _write_entry(key: str, entry: dict) -> None:
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    path = _entry_path(key)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False)
+    # Атомарная замена, чтобы параллельный читатель не увидел половину файла
+    os.replace(tmp_path, path)
+
+
+async def load(key: str):
+    """
+    Возвращает сохранённый ответ для ключа или None.
+    Запись: {"key", "etag", "last_modified", "body", "stored_at"}
+    """
+    return await asyncio.to_thread(_read_entry, key)
+
+
+async def store(key: str, etag: str, last_modified: str, body: str) -> None:
+    """Сохраняет тело ответа, если у него есть валидаторы для условного запроса"""
+    if not etag and not last_modified:
+        return
+    entry = {
+        "key": key,
+        "etag": etag,
+        "last_modified": last_modified,
+        "body": body,
+        "stored_at": time.time(),
+    }
+    try:
+        await asyncio.to_thread(_write_entry, key, entry)
+    except OSError as e:
+        print(f"Ошибка записи HTTP-кэша: {e}")
+
+
+def conditional_headers(entry) -> dict:
+    """
+    Заголовки If-None-Match / If-Modified-Since для сохранённой записи.
+    Только для GET: на POST сервер отвечает на совпавший валидатор 412.
+    """
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
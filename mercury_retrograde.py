@@ -0,0 +1,100 @@
+# mercury_retrograde.py
+
+from array import array
+from bisect import bisect_right
+from datetime import date
+
+from ephemeris import geocentric_longitude
+
+# Диапазон индекса ретроградных периодов
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+STATION_RETROGRADE = "retrograde"  # Меркурий останавливается и начинает попятное движение
+STATION_DIRECT = "direct"  # Меркурий останавливается и возвращается к прямому движению
+
+# Юлианская дата полуночи (UTC) для date.toordinal()
+_JD_ORDINAL_OFFSET = 1721424.5
+
+# Шаг поиска смен направления: ретроградный период длится не меньше трёх
+# недель, прямое движение - дольше, так что за неделю пропустить смену нельзя
+_SCAN_STEP_DAYS = 7
+# Точность уточнения момента остановки, сутки
+_STATION_PRECISION = 1 / 24
+
+# Даты остановок (date.toordinal()) по возрастанию: чётные позиции - переход
+# к ретроградному движению, нечётные - возврат к прямому. Ретроградный период
+# включает обе даты остановок. Строится один раз при первом обращении.
+_stations = None
+
+
+def _speed(jd: float) -> float:
+    """Суточное смещение Меркурия по долготе (°) около момента jd"""
+    motion = geocentric_longitude("mercury", jd + 0.5) - geocentric_longitude(
+        "mercury", jd - 0.5
+    )
+    return (motion + 180) % 360 - 180
+
+
+def _build_index() -> None:
+    global _stations
+    stations = array("i")
+    first_jd = date(FIRST_YEAR, 1, 1).toordinal() + _JD_ORDINAL_OFFSET
+    last_jd = date(LAST_YEAR, 12, 31).toordinal() + _JD_ORDINAL_OFFSET + 1
+    if _speed(first_jd) < 0:
+        # Диапазон начинается внутри ретроградного периода
+        stations.append(date(FIRST_YEAR, 1, 1).toordinal())
+    left, left_speed = first_jd, _speed(first_jd)
+    while left < last_jd:
+        right = min(left + _SCAN_STEP_DAYS, last_jd)
+        right_speed = _speed(right)
+        if (left_speed < 0) != (right_speed < 0):
+            # Между отсчётами скорость сменила знак - уточняем момент делением пополам
+            low, high, low_speed = left, right, left_speed
+            while high - low > _STATION_PRECISION:
+                middle = (low + high) / 2
+                middle_speed = _speed(middle)
+                if (middle_speed < 0) == (low_speed < 0):
+                    low, low_speed = middle, middle_speed
+                else:
+                    high = middle
+            # Календарная дата (UTC) момента остановки
+            stations.append(int(high - _JD_ORDINAL_OFFSET))
+        left, left_speed = right, right_speed
+    _stations = stations
+
+
+def _lookup(day: date) -> int:
+    if not FIRST_YEAR <= day.year <= LAST_YEAR:
+        raise ValueError(
+            f"Дата {day} вне индекса ретроградного Меркурия ({FIRST_YEAR}-{LAST_YEAR})"
+        )
+    if _stations is None:
+        _build_index()
+    return bisect_right(_stations, day.toordinal())
+
+
+def is_retrograde(day: date) -> bool:
+    """
+    Находится ли Меркурий в ретроградном движении в указанную дату.
+    Raises:
+        ValueError: дата вне диапазона FIRST_YEAR-LAST_YEAR.
+    """
+    index = _lookup(day)
+    # Нечётное число прошедших остановок - последней была остановка перед ретроградом;
+    # день возврата к прямому движению тоже считается ретроградным
+    return index % 2 == 1 or (index > 0 and _stations[index - 1] == day.toordinal())
+
+
+def next_station(day: date):
+    """
+    Ближайшая остановка Меркурия после указанной даты.
+    Returns:
+        tuple | None: (дата, STATION_RETROGRADE или STATION_DIRECT) или None,
+        если до конца индекса смен больше нет.
+    """
+    index = _lookup(day)
+    if index >= len(_stations):
+        return None
+    kind = STATION_RETROGRADE if index % 2 == 0 else STATION_DIRECT
+    return date.fromordinal(_stations[index]), kind
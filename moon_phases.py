@@ -0,0 +1,211 @@
+# moon_phases.py
+
+import math
+from array import array
+from bisect import bisect_right
+from datetime import date
+
+# Диапазон таблицы фаз
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+SYNODIC_MONTH = 29.530588861  # средний синодический месяц, сутки
+
+# Восемь фаз в порядке следования; чётные - главные (новолуние, четверти, полнолуние)
+PHASE_NAMES = (
+    "Новолуние",
+    "Молодая луна",
+    "Первая четверть",
+    "Прибывающая луна",
+    "Полнолуние",
+    "Убывающая луна",
+    "Последняя четверть",
+    "Старая луна",
+)
+
+# Главная фаза занимает 1/8 лунного месяца, по половине до и после точного момента
+_PRINCIPAL_HALF_WIDTH = SYNODIC_MONTH / 16
+
+# Юлианская дата полуночи (UTC) для date.toordinal()
+_JD_ORDINAL_OFFSET = 1721424.5
+
+# Периодические поправки (Meeus, "Astronomical Algorithms", гл. 49):
+# (коэффициент, степень E, множители M, M', F, Ω)
+_NEW_MOON_TERMS = (
+    (-0.40720, 0, 0, 1, 0, 0),
+    (0.17241, 1, 1, 0, 0, 0),
+    (0.01608, 0, 0, 2, 0, 0),
+    (0.01039, 0, 0, 0, 2, 0),
+    (0.00739, 1, -1, 1, 0, 0),
+    (-0.00514, 1, 1, 1, 0, 0),
+    (0.00208, 2, 2, 0, 0, 0),
+    (-0.00111, 0, 0, 1, -2, 0),
+    (-0.00057, 0, 0, 1, 2, 0),
+    (0.00056, 1, 1, 2, 0, 0),
+    (-0.00042, 0, 0, 3, 0, 0),
+    (0.00042, 1, 1, 0, 2, 0),
+    (0.00038, 1, 1, 0, -2, 0),
+    (-0.00024, 1, -1, 2, 0, 0),
+    (-0.00017, 0, 0, 0, 0, 1),
+    (-0.00007, 0, 2, 1, 0, 0),
+    (0.00004, 0, 0, 2, -2, 0),
+    (0.00004, 0, 3, 0, 0, 0),
+    (0.00003, 0, 1, 1, -2, 0),
+    (0.00003, 0, 0, 2, 2, 0),
+    (-0.00003, 0, 1, 1, 2, 0),
+    (0.00003, 0, -1, 1, 2, 0),
+    (-0.00002, 0, -1, 1, -2, 0),
+    (-0.00002, 0, 1, 3, 0, 0),
+    (0.00002, 0, 0, 4, 0, 0),
+)
+
+_FULL_MOON_TERMS = (
+    (-0.40614, 0, 0, 1, 0, 0),
+    (0.17302, 1, 1, 0, 0, 0),
+    (0.01614, 0, 0, 2, 0, 0),
+    (0.01043, 0, 0, 0, 2, 0),
+    (0.00734, 1, -1, 1, 0, 0),
+    (-0.00515, 1, 1, 1, 0, 0),
+    (0.00209, 2, 2, 0, 0, 0),
+    (-0.00111, 0, 0, 1, -2, 0),
+    (-0.00057, 0, 0, 1, 2, 0),
+    (0.00056, 1, 1, 2, 0, 0),
+    (-0.00042, 0, 0, 3, 0, 0),
+    (0.00042, 1, 1, 0, 2, 0),
+    (0.00038, 1, 1, 0, -2, 0),
+    (-0.00024, 1, -1, 2, 0, 0),
+    (-0.00017, 0, 0, 0, 0, 1),
+    (-0.00007, 0, 2, 1, 0, 0),
+    (0.00004, 0, 0, 2, -2, 0),
+    (0.00004, 0, 3, 0, 0, 0),
+    (0.00003, 0, 1, 1, -2, 0),
+    (0.00003, 0, 0, 2, 2, 0),
+    (-0.00003, 0, 1, 1, 2, 0),
+    (0.00003, 0, -1, 1, 2, 0),
+    (-0.00002, 0, -1, 1, -2, 0),
+    (-0.00002, 0, 1, 3, 0, 0),
+    (0.00002, 0, 0, 4, 0, 0),
+)
+
+_QUARTER_TERMS = (
+    (-0.62801, 0, 0, 1, 0, 0),
+    (0.17172, 1, 1, 0, 0, 0),
+    (-0.01183, 1, 1, 1, 0, 0),
+    (0.00862, 0, 0, 2, 0, 0),
+    (0.00804, 0, 0, 0, 2, 0),
+    (0.00454, 1, -1, 1, 0, 0),
+    (0.00204, 2, 2, 0, 0, 0),
+    (-0.00180, 0, 0, 1, -2, 0),
+    (-0.00070, 0, 0, 1, 2, 0),
+    (-0.00040, 0, 0, 3, 0, 0),
+    (-0.00034, 1, -1, 2, 0, 0),
+    (0.00032, 1, 1, 0, 2, 0),
+    (0.00032, 1, 1, 0, -2, 0),
+    (-0.00028, 2, 2, 1, 0, 0),
+    (0.00027, 1, 1, 2, 0, 0),
+    (-0.00017, 0, 0, 0, 0, 1),
+    (-0.00005, 0, -1, 1, -2, 0),
+    (0.00004, 0, 0, 2, 2, 0),
+    (-0.00004, 0, 1, 1, 2, 0),
+    (0.00004, 0, -2, 1, 0, 0),
+    (0.00003, 0, 1, 1, -2, 0),
+    (0.00003, 0, 3, 0, 0, 0),
+    (0.00002, 0, 0, 2, -2, 0),
+    (0.00002, 0, -1, 1, 2, 0),
+    (-0.00002, 0, 1, 3, 0, 0),
+)
+
+# Таблица строится один раз при первом обращении:
+# _boundaries[i] - юлианская дата начала фазы _phases[i]
+_boundaries = None
+_phases = None
+
+
+def principal_phase_jde(k: float) -> float:
+    """
+    Момент главной фазы (юлианская эфемеридная дата) по алгоритму Меёса.
+    Целое k - новолуние, k + 0.25 - первая четверть, k + 0.5 - полнолуние,
+    k + 0.75 - последняя четверть; k = 0 соответствует январю 2000 года.
+    Точность - порядка минуты, чего с запасом хватает для фазы на день.
+    """
+    t = k / 1236.85
+    jde = (
+        2451550.09766
+        + SYNODIC_MONTH * k
+        + 0.00015437 * t**2
+        - 0.000000150 * t**3
+        + 0.00000000073 * t**4
+    )
+    e = 1 - 0.002516 * t - 0.0000074 * t**2
+    m = math.radians(2.5534 + 29.10535670 * k - 0.0000014 * t**2 - 0.00000011 * t**3)
+    mp = math.radians(
+        201.5643
+        + 385.81693528 * k
+        + 0.0107582 * t**2
+        + 0.00001238 * t**3
+        - 0.000000058 * t**4
+    )
+    f = math.radians(
+        160.7108
+        + 390.67050284 * k
+        - 0.0016118 * t**2
+        - 0.00000227 * t**3
+        + 0.000000011 * t**4
+    )
+    omega = math.radians(124.7746 - 1.56375588 * k + 0.0020672 * t**2 + 0.00000215 * t**3)
+
+    fraction = round((k - math.floor(k)) * 4) % 4
+    terms = (_NEW_MOON_TERMS, _QUARTER_TERMS, _FULL_MOON_TERMS, _QUARTER_TERMS)[fraction]
+    for coefficient, e_power, m_mult, mp_mult, f_mult, omega_mult in terms:
+        angle = m_mult * m + mp_mult * mp + f_mult * f + omega_mult * omega
+        jde += coefficient * e**e_power * math.sin(angle)
+
+    if fraction in (1, 3):
+        w = (
+            0.00306
+            - 0.00038 * e * math.cos(m)
+            + 0.00026 * math.cos(mp)
+            - 0.00002 * math.cos(mp - m)
+            + 0.00002 * math.cos(mp + m)
+            + 0.00002 * math.cos(2 * f)
+        )
+        jde += w if fraction == 1 else -w
+    return jde
+
+
+def _build_table() -> None:
+    global _boundaries, _phases
+    boundaries = array("d")
+    phases = array("b")
+    # Запас в один лунный месяц с каждой стороны диапазона
+    first_k = math.floor((FIRST_YEAR - 2000) * 12.3685) - 1
+    last_k = math.ceil((LAST_YEAR + 1 - 2000) * 12.3685) + 1
+    for k in range(first_k, last_k + 1):
+        for quarter in range(4):
+            moment = principal_phase_jde(k + quarter / 4)
+            principal = quarter * 2
+            boundaries.append(moment - _PRINCIPAL_HALF_WIDTH)
+            phases.append(principal)
+            # После главной фазы - промежуточная до начала следующей главной
+            boundaries.append(moment + _PRINCIPAL_HALF_WIDTH)
+            phases.append(principal + 1)
+    _boundaries, _phases = boundaries, phases
+
+
+def get_phase_index(day: date) -> int:
+    """
+    Номер фазы Луны (индекс в PHASE_NAMES) в полдень указанной даты.
+    Raises:
+        ValueError: дата вне диапазона FIRST_YEAR-LAST_YEAR.
+    """
+    if not FIRST_YEAR <= day.year <= LAST_YEAR:
+        raise ValueError(f"Дата {day} вне таблицы фаз Луны ({FIRST_YEAR}-{LAST_YEAR})")
+    if _boundaries is None:
+        _build_table()
+    jd_noon = day.toordinal() + _JD_ORDINAL_OFFSET + 0.5
+    return _phases[bisect_right(_boundaries, jd_noon) - 1]
+
+
+def get_phase_name(day: date) -> str:
+    """Название фазы Луны для даты"""
+    return PHASE_NAMES[get_phase_index(day)]
@@ -0,0 +1,257 @@
+# natal_chart.py
+
+import math
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from ephemeris import (
+    apparent_longitude,
+    sun_longitude,
+    moon_longitude,
+    obliquity,
+    local_sidereal_time,
+)
+from zodiac import ZODIAC_SIGNS
+
+# Планеты карты в порядке вывода: (ключ, название, символ)
+PLANETS = (
+    ("sun", "Солнце", "☀️"),
+    ("moon", "Луна", "🌙"),
+    ("mercury", "Меркурий", "☿️"),
+    ("venus", "Венера", "♀️"),
+    ("mars", "Марс", "♂️"),
+    ("jupiter", "Юпитер", "♃"),
+    ("saturn", "Сатурн", "♄"),
+    ("uranus", "Уран", "♅"),
+    ("neptune", "Нептун", "♆"),
+    ("pluto", "Плутон", "♇"),
+)
+
+# Город -> (широта, восточная долгота, часовой пояс IANA). Смещение от UTC
+# берётся из базы часовых поясов на момент рождения, с летним временем и
+# историческими сменами поясов
+CITY_COORDINATES = {
+    "краснодар": (45.0448, 38.9760, "Europe/Moscow"),
+    "москва": (55.7558, 37.6173, "Europe/Moscow"),
+    "санкт-петербург": (59.9343, 30.3351, "Europe/Moscow"),
+    "новосибирск": (55.0084, 82.9357, "Asia/Novosibirsk"),
+    "екатеринбург": (56.8389, 60.6057, "Asia/Yekaterinburg"),
+    "казань": (55.7963, 49.1088, "Europe/Moscow"),
+    "нижний новгород": (56.2965, 43.9361, "Europe/Moscow"),
+    "челябинск": (55.1644, 61.4368, "Asia/Yekaterinburg"),
+    "самара": (53.1959, 50.1002, "Europe/Samara"),
+    "омск": (54.9885, 73.3242, "Asia/Omsk"),
+    "ростов-на-дону": (47.2357, 39.7015, "Europe/Moscow"),
+    "уфа": (54.7388, 55.9721, "Asia/Yekaterinburg"),
+    "красноярск": (56.0153, 92.8932, "Asia/Krasnoyarsk"),
+    "воронеж": (51.6720, 39.1843, "Europe/Moscow"),
+    "пермь": (58.0105, 56.2502, "Asia/Yekaterinburg"),
+    "волгоград": (48.7080, 44.5133, "Europe/Volgograd"),
+    "саратов": (51.5331, 46.0342, "Europe/Saratov"),
+    "тюмень": (57.1522, 65.5272, "Asia/Yekaterinburg"),
+    "иркутск": (52.2870, 104.3050, "Asia/Irkutsk"),
+    "хабаровск": (48.4827, 135.0838, "Asia/Vladivostok"),
+    "владивосток": (43.1155, 131.8855, "Asia/Vladivostok"),
+    "ставрополь": (45.0428, 41.9734, "Europe/Moscow"),
+    "сочи": (43.6028, 39.7342, "Europe/Moscow"),
+    "новороссийск": (44.7235, 37.7686, "Europe/Moscow"),
+    "анапа": (44.8951, 37.3161, "Europe/Moscow"),
+    "армавир": (44.9892, 41.1234, "Europe/Moscow"),
+    "майкоп": (44.6098, 40.1006, "Europe/Moscow"),
+    "симферополь": (44.9521, 34.1024, "Europe/Simferopol"),
+    "севастополь": (44.6166, 33.5254, "Europe/Simferopol"),
+    "калининград": (54.7104, 20.4522, "Europe/Kaliningrad"),
+    "мурманск": (68.9585, 33.0827, "Europe/Moscow"),
+    "минск": (53.9006, 27.5590, "Europe/Minsk"),
+    "киев": (50.4501, 30.5234, "Europe/Kiev"),
+    "алматы": (43.2220, 76.8512, "Asia/Almaty"),
+    "ташкент": (41.2995, 69.2401, "Asia/Tashkent"),
+    "баку": (40.4093, 49.8671, "Asia/Baku"),
+    "ереван": (40.1872, 44.5152, "Asia/Yerevan"),
+    "тбилиси": (41.7151, 44.8271, "Asia/Tbilisi"),
+}
+
+# Место по умолчанию (как в ссылке на astro-seek)
+DEFAULT_PLACE = "краснодар"
+
+# Выше этой широты система Плацидуса не определена, дома считаются по Порфирию
+PLACIDUS_MAX_LATITUDE = 66.0
+
+
+def normalize_place(birth_place: str) -> str:
+    """Приводит название города к ключу CITY_COORDINATES"""
+    place = (birth_place or "").strip().lower().replace("ё", "е")
+    for prefix in ("г. ", "г.", "город "):
+        if place.startswith(prefix):
+            place = place[len(prefix):].strip()
+    return place
+
+
+def resolve_place(birth_place: str) -> tuple:
+    """
+    Координаты места рождения.
+    Returns:
+        tuple: (ключ города, широта, долгота, часовой пояс IANA, найден ли город)
+    """
+    place = normalize_place(birth_place)
+    if place in CITY_COORDINATES:
+        return (place, *CITY_COORDINATES[place], True)
+    return (DEFAULT_PLACE, *CITY_COORDINATES[DEFAULT_PLACE], False)
+
+
+def parse_birth_time(birth_time: str):
+    """Время "ЧЧ:ММ" -> (часы, минуты) или None, если время не указано"""
+    if not birth_time or birth_time == "-":
+        return None
+    parts = birth_time.split(":")
+    try:
+        hour, minute = int(parts[0]), int(parts[1])
+    except (IndexError, ValueError):
+        return None
+    if 0 <= hour <= 23 and 0 <= minute <= 59:
+        return hour, minute
+    return None
+
+
+def _julian_day(moment: datetime) -> float:
+    """Юлианская дата момента UTC"""
+    return (
+        moment.toordinal()
+        + 1721424.5
+        + (moment.hour * 3600 + moment.minute * 60 + moment.second) / 86400
+    )
+
+
+def _ecliptic_from_ra(right_ascension: float, eps: float) -> float:
+    """Долгота точки эклиптики с заданным прямым восхождением (радианы)"""
+    return math.atan2(math.sin(right_ascension), math.cos(right_ascension) * math.cos(eps))
+
+
+def _placidus_cusp(ramc: float, eps: float, latitude: float, fraction: float, above: bool) -> float:
+    """
+    Куспид Плацидуса: точка эклиптики, прошедшая fraction своей полудуги.
+    above=True - дома 11-12 (дневная полудуга от MC), False - дома 2-3
+    (ночная полудуга от IC). Решается итерациями по склонению куспида.
+    """
+    tan_lat = math.tan(latitude)
+    longitude = ramc + (math.pi / 2) * (fraction if above else 1 + fraction)
+    for _ in range(20):
+        declination = math.asin(math.sin(eps) * math.sin(longitude))
+        diurnal = math.acos(max(-1.0, min(1.0, -tan_lat * math.tan(declination))))
+        if above:
+            right_ascension = ramc + fraction * diurnal
+        else:
+            right_ascension = ramc + math.pi - (1 - fraction) * (math.pi - diurnal)
+        updated = _ecliptic_from_ra(right_ascension, eps)
+        if abs((updated - longitude + math.pi) % (2 * math.pi) - math.pi) < 1e-9:
+            longitude = updated
+            break
+        longitude = updated
+    return longitude
+
+
+def _house_cusps(ramc: float, eps: float, latitude: float, ascendant: float, midheaven: float) -> list:
+    """Куспиды 12 домов в градусах (Плацидус, у полюсов - Порфирий)"""
+    if abs(math.degrees(latitude)) < PLACIDUS_MAX_LATITUDE:
+        cusp11 = _placidus_cusp(ramc, eps, latitude, 1 / 3, True)
+        cusp12 = _placidus_cusp(ramc, eps, latitude, 2 / 3, True)
+        cusp2 = _placidus_cusp(ramc, eps, latitude, 1 / 3, False)
+        cusp3 = _placidus_cusp(ramc, eps, latitude, 2 / 3, False)
+        quadrant = [math.degrees(c) % 360 for c in (cusp11, cusp12, cusp2, cusp3)]
+    else:
+        # Порфирий: деление квадрантов MC-ASC и ASC-IC на три равные части
+        asc, mc = math.degrees(ascendant), math.degrees(midheaven)
+        upper = (asc - mc) % 360 / 3
+        lower = (mc + 180 - asc) % 360 / 3
+        quadrant = [(mc + upper) % 360, (mc + 2 * upper) % 360, (asc + lower) % 360, (asc + 2 * lower) % 360]
+    cusp11, cusp12, cusp2, cusp3 = quadrant
+    asc, mc = math.degrees(ascendant) % 360, math.degrees(midheaven) % 360
+    first_half = [asc, cusp2, cusp3, (mc + 180) % 360, (cusp11 + 180) % 360, (cusp12 + 180) % 360]
+    return first_half + [(c + 180) % 360 for c in first_half]
+
+
+def house_of(longitude: float, cusps: list) -> int:
+    """Номер дома (1-12), в котором находится точка эклиптики"""
+    for house in range(12):
+        start, end = cusps[house], cusps[(house + 1) % 12]
+        if (longitude - start) % 360 < (end - start) % 360:
+            return house + 1
+    return 12
+
+
+def compute_natal_chart(
+    day: int,
+    month: int,
+    year: int,
+    time_of_birth: tuple = None,
+    latitude: float = CITY_COORDINATES[DEFAULT_PLACE][0],
+    longitude: float = CITY_COORDINATES[DEFAULT_PLACE][1],
+    time_zone: str = CITY_COORDINATES[DEFAULT_PLACE][2],
+) -> dict:
+    """
+    Расчёт натальной карты по аналитическим формулам (кеплеровы элементы JPL
+    для планет, ряд Меёса для Луны). Без времени рождения положения планет
+    берутся на местный полдень, а асцендент и дома не вычисляются.
+    Returns:
+        dict: {"planets": {ключ: долгота°}, "ascendant", "midheaven",
+        "houses": [12 куспидов°] или None}
+    """
+    hour, minute = time_of_birth or (12, 0)
+    local_moment = datetime(year, month, day, hour, minute, tzinfo=ZoneInfo(time_zone))
+    jd = _julian_day(local_moment.astimezone(timezone.utc))
+
+    planets = {}
+    for key, _, _ in PLANETS:
+        if key == "sun":
+            planets[key] = sun_longitude(jd)
+        elif key == "moon":
+            planets[key] = moon_longitude(jd)
+        else:
+            planets[key] = apparent_longitude(key, jd)
+
+    chart = {"planets": planets, "ascendant": None, "midheaven": None, "houses": None}
+    if time_of_birth is None:
+        return chart
+
+    eps = math.radians(obliquity(jd))
+    lat = math.radians(latitude)
+    ramc = math.radians(local_sidereal_time(jd, longitude))
+    midheaven = _ecliptic_from_ra(ramc, eps)
+    ascendant = math.atan2(
+        math.cos(ramc), -(math.sin(ramc) * math.cos(eps) + math.tan(lat) * math.sin(eps))
+    )
+    chart["ascendant"] = math.degrees(ascendant) % 360
+    chart["midheaven"] = math.degrees(midheaven) % 360
+    chart["houses"] = _house_cusps(ramc, eps, lat, ascendant, midheaven)
+    return chart
+
+
+def format_position(longitude: float) -> str:
+    """Долгота эклиптики -> "Весы 12°34'" """
+    sign = ZODIAC_SIGNS[int(longitude // 30) % 12]
+    degrees_in_sign = longitude % 30
+    degrees = int(degrees_in_sign)
+    minutes = int((degrees_in_sign - degrees) * 60)
+    return f"{sign} {degrees}°{minutes:02d}'"
+
+
+def format_natal_chart(chart: dict) -> list:
+    """Строки с положениями планет, асцендентом и домами для сообщения"""
+    lines = ["🪐 Положения планет:"]
+    houses = chart.get("houses")
+    for key, name, symbol in PLANETS:
+        position = chart["planets"][key]
+        line = f"{symbol} {name}: {format_position(position)}"
+        if houses:
+            line += f" ({house_of(position, houses)} дом)"
+        lines.append(line)
+    if chart.get("ascendant") is not None:
+        lines.append("")
+        lines.append(f"⬆️ Асцендент: {format_position(chart['ascendant'])}")
+        lines.append(f"🔝 MC: {format_position(chart['midheaven'])}")
+    if houses:
+        lines.append("")
+        lines.append("🏠 Куспиды домов:")
+        for number, cusp in enumerate(houses, start=1):
+            lines.append(f"{number}: {format_position(cusp)}")
+    return lines
@@ -0,0 +1,109 @@
+# rambler_parser.py
+
+from html.parser import HTMLParser
+
+# Класс контейнера с текстом гороскопа на rambler.ru
+ARTICLE_CONTAINER_CLASS = "article__text"
+
+
+class ArticleTextParser(HTMLParser):
+    """
+    Потоковый извлекатель абзацев гороскопа из HTML.
+
+    HTML подаётся кусками через feed(). Как только закрывается div с классом
+    article__text, содержащий абзацы, флаг done становится True и остаток
+    страницы можно не читать. Если такого контейнера нет, запасным вариантом
+    служит первый div с непустыми абзацами, без <script> и с малым числом
+    вложенных div. HTML-сущности декодируются самим парсером.
+    """
+
+    def __init__(self, container_class: str = ARTICLE_CONTAINER_CLASS):
+        super().__init__(convert_charrefs=True)
+        self.container_class = container_class
+        self.done = False
+        self.article_paragraphs = None
+        self.fallback_paragraphs = None
+        # Открытые div: {"article": bool, "paragraphs": [...], "divs": int, "script": bool}
+        self._div_stack = []
+        self._paragraph_parts = None  # текст текущего <p>
+        self._script_depth = 0
+
+    @property
+    def paragraphs(self) -> list:
+        """Абзацы из основного контейнера или, если его нет, из запасного"""
+        return self.article_paragraphs or self.fallback_paragraphs or []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in ("script", "style"):
+            self._script_depth += 1
+            if tag == "script":
+                for frame in self._div_stack:
+                    frame["script"] = True
+        elif tag == "div":
+            for frame in self._div_stack:
+                frame["divs"] += 1
+            classes = (dict(attrs).get("class") or "").split()
+            self._div_stack.append(
+                {
+                    "article": any(self.container_class in c for c in classes),
+                    "paragraphs": [],
+                    "divs": 0,
+                    "script": False,
+                }
+            )
+        elif tag == "p" and self._div_stack:
+            self._paragraph_parts = []
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag in ("script", "style"):
+            self._script_depth = max(0, self._script_depth - 1)
+        elif tag == "p":
+            self._finish_paragraph()
+        elif tag == "div" and self._div_stack:
+            # Незакрытый <p> заканчивается вместе со своим div, как в браузере
+            self._finish_paragraph()
+            frame = self._div_stack.pop()
+            if frame["article"] and frame["paragraphs"]:
+                self.article_paragraphs = frame["paragraphs"]
+                self.done = True
+            elif (
+                self.fallback_paragraphs is None
+                and frame["paragraphs"]
+                and frame["divs"] < 5
+                and not frame["script"]
+            ):
+                self.fallback_paragraphs = frame["paragraphs"]
+
+    def _finish_paragraph(self):
+        """Завершает текущий <p>; лишний или запоздавший </p> игнорируется"""
+        if self._paragraph_parts is None:
+            return
+        text = "".join(self._paragraph_parts).replace("\xa0", " ").strip()
+        self._paragraph_parts = None
+        if text and self._div_stack:
+            # Абзац принадлежит ближайшему div и всем объемлющим контейнерам статьи
+            self._div_stack[-1]["paragraphs"].append(text)
+            for frame in self._div_stack[:-1]:
+                if frame["article"]:
+                    frame["paragraphs"].append(text)
+
+    def handle_data(self, data):
+        if self._paragraph_parts is not None and not self._script_depth:
+            self._paragraph_parts.append(data)
+
+
+def extract_article_paragraphs(html: str) -> tuple:
+    """
+    Разбор страницы целиком; пригоден для запуска в отдельном процессе.
+    Returns:
+        tuple: (абзацы основного контейнера или None, абзацы запасного или None)
+    """
+    parser = ArticleTextParser()
+    parser.feed(html)
+    if not parser.done:
+        parser.close()
+    return parser.article_paragraphs, parser.fallback_paragraphs
@@ -3,34 +3,87 @@
 import asyncio
 import datetime
 from aiogram import Bot
-from database import get_subscribed_users
-from horoscope_api import get_daily_horoscope
-from config import DAILY_TIME_HOUR, DAILY_TIME_MINUTE
+from database import iter_subscribed_users
+from horoscope_api import get_daily_horoscope, get_horoscope_message, MESSAGE_BROADCAST
+from zodiac import ZODIAC_API_MAP
+from config import (
+    DAILY_TIME_HOUR,
+    DAILY_TIME_MINUTE,
+    PREWARM_MINUTES_BEFORE,
+    PREWARM_CONCURRENCY,
+    PREWARM_RETRIES,
+    PREWARM_RETRY_DELAY,
+)
+
+
+async def prewarm_horoscopes(timeout: float = None) -> list:
+    """
+    Предзагрузка прогнозов всех знаков, чтобы рассылка шла из кэша.
+    Через timeout секунд незавершённые знаки бросаются (их загрузки
+    продолжаются в фоне), чтобы рассылка началась вовремя.
+    Returns:
+        list: Знаки, для которых не удалось получить прогноз из внешних
+        источников или которые не успели загрузиться за timeout.
+    """
+    semaphore = asyncio.Semaphore(PREWARM_CONCURRENCY)
+
+    async def warm(sign: str) -> bool:
+        for attempt in range(PREWARM_RETRIES + 1):
+            # Семафор держится только на время загрузки, не во время паузы между попытками
+            async with semaphore:
+                try:
+                    # Повторные попытки идут мимо кэша, где уже лежит прогноз по умолчанию
+                    horoscope_data = await get_daily_horoscope(
+                        sign, force_refresh=attempt > 0
+                    )
+                    if horoscope_data.get("forecast", {}).get("source") != "default":
+                        return True
+                except Exception as e:
+                    print(f"Ошибка предзагрузки гороскопа для {sign}: {e}")
+            if attempt < PREWARM_RETRIES:
+                await asyncio.sleep(PREWARM_RETRY_DELAY)
+        return False
+
+    signs = list(ZODIAC_API_MAP)
+    tasks = {asyncio.ensure_future(warm(sign)): sign for sign in signs}
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    failed = [tasks[task] for task in tasks if task in done and not task.result()]
+    unfinished = [tasks[task] for task in tasks if task in pending]
+    if unfinished:
+        print(
+            f"Предзагрузка: не успели до рассылки {', '.join(unfinished)} - прогноз будет загружен при отправке"
+        )
+    if failed:
+        print(
+            f"Предзагрузка: не удалось получить прогноз для {', '.join(failed)} - будет использован прогноз по умолчанию"
+        )
+    if not failed and not unfinished:
+        print(f"Предзагрузка: прогнозы для всех {len(signs)} знаков готовы")
+    return failed + unfinished
 
 
 async def send_daily_horoscopes(bot: Bot):
     """Отправка ежедневных гороскопов подписчикам"""
     try:
-        users = await get_subscribed_users()
-        print(f"Отправка гороскопов {len(users)} пользователям")
+        print("Начинаем отправку гороскопов подписчикам")
+        sent_count = 0
 
-        for user_id, zodiac_sign in users:
+        async for user_id, zodiac_sign in iter_subscribed_users():
             try:
-                horoscope_data = await get_daily_horoscope(zodiac_sign)
-
-                message = f"🌅 Доброе утро! Ежедневный гороскоп для {zodiac_sign}\n\n"
-                if horoscope_data.get("date"):
-                    message += f"📅 {horoscope_data['date']}\n\n"
-                message += f"{horoscope_data['description']}\n\n"
-
-                message += "\n💫 Хорошего дня!"
+                # Текст рассылки для знака собирается один раз в день
+                message = await get_horoscope_message(zodiac_sign, MESSAGE_BROADCAST)
 
                 await bot.send_message(user_id, message)
+                sent_count += 1
                 print(f"Гороскоп отправлен пользователю {user_id}")
                 await asyncio.sleep(0.1)  # Небольшая задержка чтобы не спамить
             except Exception as e:
                 print(f"Ошибка отправки гороскопа пользователю {user_id}: {e}")
                 continue
+
+        print(f"Гороскопы отправлены {sent_count} пользователям")
     except Exception as e:
         print(f"Ошибка в send_daily_horoscopes: {e}")
 
@@ -56,7 +109,22 @@ async def scheduler(bot: Bot):
                 f"Следующая отправка гороскопов через {hours} часов {minutes} минут ({target_time.strftime('%d.%m.%Y %H:%M')})"
             )
 
-            await asyncio.sleep(wait_seconds)
+            # Предзагрузка имеет смысл, только если она попадает в тот же день,
+            # что и рассылка: прогнозы кэшируются по календарной дате
+            prewarm_time = target_time - datetime.timedelta(minutes=PREWARM_MINUTES_BEFORE)
+            if prewarm_time.date() == target_time.date():
+                await asyncio.sleep(
+                    max(0.0, (prewarm_time - datetime.datetime.now()).total_seconds())
+                )
+                # Предзагрузка не должна задерживать рассылку (например, при старте бота
+                # меньше чем за PREWARM_MINUTES_BEFORE минут до неё)
+                await prewarm_horoscopes(
+                    timeout=max(0.0, (target_time - datetime.datetime.now()).total_seconds())
+                )
+
+            await asyncio.sleep(
+                max(0.0, (target_time - datetime.datetime.now()).total_seconds())
+            )
 
             # Отправляем гороскопы
             await send_daily_horoscopes(bot)
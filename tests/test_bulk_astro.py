@@ -0,0 +1,63 @@
+# tests/test_bulk_astro.py
+
+import random
+
+import pytest
+
+import bulk_astro
+from bulk_astro import SIGN_UNKNOWN, life_numbers, sign_codes, sign_names
+from zodiac import calculate_life_number, get_zodiac_sign, get_zodiac_sign_for_date
+
+
+def _dates():
+    """Все комбинации с краевыми днями, месяцами и годами плюс случайные даты"""
+    days, months, years = [], [], []
+    for year in (1850, 1899, 1900, 1990, 2000, 2023, 2024, 2100, 2101):
+        for month in range(0, 14):
+            for day in range(0, 33):
+                days.append(day)
+                months.append(month)
+                years.append(year)
+    rng = random.Random(0)
+    for _ in range(2000):
+        days.append(rng.randint(1, 31))
+        months.append(rng.randint(1, 12))
+        years.append(rng.randint(1900, 2030))
+    return days, months, years
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(bulk_astro, "np", None)
+    elif bulk_astro.np is None:
+        pytest.skip("NumPy не установлен")
+    return request.param
+
+
+def test_sign_codes_match_get_zodiac_sign(backend):
+    days, months, _ = _dates()
+    names = sign_names(sign_codes(days, months))
+    assert names == [get_zodiac_sign(d, m) for d, m in zip(days, months)]
+
+
+def test_sign_codes_match_get_zodiac_sign_for_date(backend):
+    days, months, years = _dates()
+    names = sign_names(sign_codes(days, months, years))
+    for name, day, month, year in zip(names, days, months, years):
+        if 1 <= month <= 12:
+            assert name == get_zodiac_sign_for_date(day, month, year), (day, month, year)
+        else:
+            assert name == "Неизвестно"
+
+
+def test_missing_dates(backend):
+    # Без года, как get_zodiac_sign, принимается любой день 1-31
+    assert list(sign_codes([30, 31], [2, 6])) != [SIGN_UNKNOWN, SIGN_UNKNOWN]
+    assert list(sign_codes([30, 31, 29], [2, 6, 2], [2024, 2024, 2023])) == [SIGN_UNKNOWN] * 3
+
+
+def test_life_numbers_match_calculate_life_number(backend):
+    days, months, years = _dates()
+    numbers = [int(n) for n in life_numbers(days, months, years)]
+    assert numbers == [calculate_life_number(d, m, y) for d, m, y in zip(days, months, years)]
@@ -0,0 +1,161 @@
+# tests/test_circuit_breaker.py
+
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+import circuit_breaker
+import horoscope_api
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    # Подменяем только часы автомата: цикл событий тоже использует time.monotonic
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_opens_after_threshold_and_probes_after_cooldown(clock):
+    breaker = CircuitBreaker("example.com", failure_threshold=3, cooldown=60)
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock[0] += 60
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # Пока пробный запрос не завершён, остальные отклоняются
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("example.com", failure_threshold=1, cooldown=60)
+    breaker.record_failure()
+    clock[0] += 60
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["retry_in"] == 60
+    clock[0] += 59
+    assert not breaker.allow_request()
+
+
+def test_success_resets_consecutive_failures():
+    breaker = CircuitBreaker("example.com", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+class FakeSession:
+    """Сессия с управляемыми ответами: статус или исключение, с задержкой"""
+
+    def __init__(self, outcome, delay=0.0):
+        self.outcome = outcome
+        self.delay = delay
+        self.requests = 0
+
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(self.outcome, BaseException):
+            raise self.outcome
+        yield type("Response", (), {"status": self.outcome})()
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(horoscope_api, "_circuit_breakers", {})
+    monkeypatch.setattr(horoscope_api, "BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(horoscope_api, "BREAKER_COOLDOWN", 60)
+    fake = FakeSession(200)
+
+    async def get_http_session():
+        return fake
+
+    monkeypatch.setattr(horoscope_api, "get_http_session", get_http_session)
+    return fake
+
+
+async def _request(url="https://example.com/page"):
+    async with horoscope_api._guarded_request("GET", url) as response:
+        return response.status
+
+
+def test_guarded_request_opens_on_server_errors(session):
+    session.outcome = 503
+
+    async def main():
+        assert await _request() == 503
+        assert await _request() == 503
+        with pytest.raises(CircuitOpenError):
+            await _request()
+        # Другой хост не затронут
+        assert await _request("https://other.example.org/") == 503
+
+    asyncio.run(main())
+    assert session.requests == 3
+
+
+def test_guarded_request_counts_network_errors(session):
+    session.outcome = aiohttp.ClientConnectionError()
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientConnectionError):
+                await _request()
+        with pytest.raises(CircuitOpenError):
+            await _request()
+
+    asyncio.run(main())
+
+
+def test_single_probe_in_half_open(session, clock):
+    session.outcome = 503
+
+    async def main():
+        await _request()
+        await _request()
+        clock[0] += 60
+        session.outcome, session.delay = 200, 0.05
+        results = await asyncio.gather(_request(), _request(), _request(), return_exceptions=True)
+        return results
+
+    results = asyncio.run(main())
+    assert results.count(200) == 1
+    assert sum(isinstance(r, CircuitOpenError) for r in results) == 2
+    assert horoscope_api.get_circuit_breaker("https://example.com/").state == CLOSED
+
+
+def test_cancelled_probe_is_released(session, clock):
+    session.outcome = 503
+
+    async def main():
+        await _request()
+        await _request()
+        clock[0] += 60
+        session.delay = 1
+        probe = asyncio.ensure_future(_request())
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        # Отменённая проба не блокирует следующую
+        session.outcome, session.delay = 200, 0
+        return await _request()
+
+    assert asyncio.run(main()) == 200
@@ -0,0 +1,135 @@
+# tests/test_database.py
+
+import asyncio
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def run_db(tmp_path, monkeypatch):
+    """Запускает сценарий на свежей БД во временном каталоге"""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "users.db"))
+    monkeypatch.setattr(database, "_db", None)
+    monkeypatch.setattr(database, "_write_lock", asyncio.Lock())
+    monkeypatch.setattr(database, "_pending_users", {})
+    monkeypatch.setattr(database, "_flushing_users", {})
+    monkeypatch.setattr(database, "_flush_event", None)
+    monkeypatch.setattr(database, "_flush_task", None)
+    monkeypatch.setattr(database, "profile_cache", database.ProfileCache())
+    monkeypatch.setattr(database, "_translation_cache_rows", None)
+
+    def run(scenario):
+        async def main():
+            await database.init_db()
+            try:
+                return await scenario()
+            finally:
+                await database.close_db()
+
+        return asyncio.run(main())
+
+    return run
+
+
+async def _translation_keys():
+    db = await database.get_db()
+    async with db.execute("SELECT key FROM translation_cache ORDER BY key") as cursor:
+        return [row[0] for row in await cursor.fetchall()]
+
+
+def test_translation_cache_evicts_least_recently_used(run_db, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(database.time, "time", lambda: next(clock))
+
+    async def scenario():
+        for key in ("a", "b", "c"):
+            await database.save_cached_translation(key, key.upper(), 3)
+        # Чтение "a" делает его самым свежим: вытеснен должен быть "b"
+        assert await database.get_cached_translation("a") == "A"
+        await database.save_cached_translation("d", "D", 3)
+        return await _translation_keys()
+
+    assert run_db(scenario) == ["a", "c", "d"]
+
+
+def test_translation_cache_prunes_only_over_limit(run_db):
+    async def scenario():
+        for key in ("a", "b", "a", "b"):
+            await database.save_cached_translation(key, key.upper(), 2)
+        assert await _translation_keys() == ["a", "b"]
+        await database.save_cached_translation("c", "C", 2)
+        return len(await _translation_keys()), database._translation_cache_rows
+
+    assert run_db(scenario) == (2, 2)
+
+
+def test_pending_write_is_visible_before_flush(run_db):
+    async def scenario():
+        await database.save_user(1)
+        await database.update_user_data(1, "31.07.1990", "Лев", "14:30", "Москва")
+        assert database._pending_users
+        database.profile_cache.invalidate(1)
+        return await database.get_user_data(1)
+
+    row = run_db(scenario)
+    assert row[:4] == ("31.07.1990", "Лев", "14:30", "Москва")
+    assert row[4:] == (31, 7, 1990, 3)
+
+
+def test_read_during_flush_sees_own_writes(run_db):
+    async def scenario():
+        await database.save_user(1)
+        for year in range(1950, 2000):
+            birth_date = f"01.01.{year}"
+            await database.update_user_data(1, birth_date, "Козерог")
+            database.profile_cache.invalidate(1)
+            _, row = await asyncio.gather(
+                database.flush_pending_writes(), database.get_user_data(1)
+            )
+            assert row[0] == birth_date
+            assert database.profile_cache.peek(1)[0] == birth_date
+
+    run_db(scenario)
+
+
+def test_writes_survive_close(run_db):
+    async def scenario():
+        for tg_id in range(1, 301):
+            await database.save_user(tg_id)
+        await database.update_user_data(7, "15.03.1985", "Рыбы")
+        await database.close_db()
+        database.profile_cache.invalidate(7)
+        db = await database.get_db()
+        async with db.execute("SELECT COUNT(*) FROM users") as cursor:
+            count = (await cursor.fetchone())[0]
+        return count, await database.get_user_data(7)
+
+    count, row = run_db(scenario)
+    assert count == 300
+    assert row[:2] == ("15.03.1985", "Рыбы")
+
+
+def test_failed_flush_keeps_newer_writes(run_db, monkeypatch):
+    async def scenario():
+        await database.save_user(1)
+        await database.update_user_data(1, "01.01.1990", "Козерог")
+        db = await database.get_db()
+        original = db.executemany
+
+        async def failing(sql, params):
+            # Во время сбойного сброса приходит более свежее изменение
+            await database.update_user_data(1, "02.02.1992", "Водолей")
+            raise RuntimeError("disk I/O error")
+
+        monkeypatch.setattr(db, "executemany", failing)
+        with pytest.raises(RuntimeError):
+            await database.flush_pending_writes()
+        monkeypatch.setattr(db, "executemany", original)
+        await database.flush_pending_writes()
+        database.profile_cache.invalidate(1)
+        return await database.get_user_data(1)
+
+    row = run_db(scenario)
+    assert row[:2] == ("02.02.1992", "Водолей")
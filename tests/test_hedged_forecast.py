@@ -0,0 +1,97 @@
+# tests/test_hedged_forecast.py
+
+import asyncio
+
+import pytest
+
+import horoscope_api
+
+ENGLISH = "Today is a good day to start something new and bold."
+RUSSIAN = "Сегодня хороший день, чтобы начать что-то новое и смелое."
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Заглушки источников: поведение задаётся полями словаря"""
+    state = {
+        "rambler_delay": 0.0,
+        "rambler": {"description": RUSSIAN, "source": "rambler"},
+        "aztro_delay": 0.0,
+        "aztro_started": False,
+        "translate_delay": 0.0,
+        "translate_calls": 0,
+    }
+
+    async def rambler(sign, force_refresh=False, fallback=True):
+        await asyncio.sleep(state["rambler_delay"])
+        return state["rambler"]
+
+    async def aztro(sign, force_refresh=False, fallback=True, translate=True):
+        state["aztro_started"] = True
+        await asyncio.sleep(state["aztro_delay"])
+        return {"description": ENGLISH, "source": "aztro", "translation_attempted": translate}
+
+    async def translate(text):
+        state["translate_calls"] += 1
+        await asyncio.sleep(state["translate_delay"])
+        return RUSSIAN
+
+    monkeypatch.setattr(horoscope_api, "HEDGE_DELAY", 0.05)
+    monkeypatch.setattr(horoscope_api, "FORECAST_DEADLINE", 0.3)
+    monkeypatch.setattr(horoscope_api, "get_astrological_forecast", rambler)
+    monkeypatch.setattr(horoscope_api, "get_alternative_forecast", aztro)
+    monkeypatch.setattr(horoscope_api, "translate_text", translate)
+    return state
+
+
+async def _timed(coro):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await coro
+    return result, loop.time() - started
+
+
+def test_primary_answers_before_hedge(sources):
+    result, _ = asyncio.run(_timed(horoscope_api.get_hedged_forecast("Овен")))
+    assert result["source"] == "rambler"
+    assert not sources["aztro_started"]
+
+
+def test_secondary_wins_and_is_translated(sources):
+    sources["rambler_delay"] = 5
+    result, elapsed = asyncio.run(_timed(horoscope_api.get_hedged_forecast("Овен")))
+    assert result["source"] == "aztro"
+    assert result["description"] == RUSSIAN
+    assert result["translation_attempted"]
+    assert elapsed < 0.3
+
+
+def test_translation_stays_within_deadline(sources):
+    sources["rambler_delay"] = 5
+    sources["translate_delay"] = 5
+    result, elapsed = asyncio.run(_timed(horoscope_api.get_hedged_forecast("Овен")))
+    assert elapsed < 0.4
+    assert result["description"] == ENGLISH
+    assert result["translation_attempted"]
+
+
+def test_default_forecast_after_deadline(sources):
+    sources["rambler_delay"] = 5
+    sources["aztro_delay"] = 5
+    result, elapsed = asyncio.run(_timed(horoscope_api.get_hedged_forecast("Овен")))
+    assert result["source"] == "default"
+    assert elapsed < 0.4
+
+
+def test_failed_primary_starts_hedge_immediately(sources):
+    sources["rambler"] = None
+    result, elapsed = asyncio.run(_timed(horoscope_api.get_hedged_forecast("Овен")))
+    assert result["source"] == "aztro"
+    assert elapsed < 0.05
+
+
+def test_enhanced_text_does_not_translate_again(sources):
+    forecast = {"description": ENGLISH, "source": "aztro", "translation_attempted": True}
+    text = asyncio.run(horoscope_api.generate_enhanced_forecast_text("Овен", forecast, {}))
+    assert ENGLISH in text
+    assert sources["translate_calls"] == 0
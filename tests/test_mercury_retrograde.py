@@ -0,0 +1,52 @@
+# tests/test_mercury_retrograde.py
+
+from datetime import date, timedelta
+
+import pytest
+
+from mercury_retrograde import (
+    STATION_DIRECT,
+    STATION_RETROGRADE,
+    is_retrograde,
+    next_station,
+)
+
+# Остановки Меркурия 2023-2025 (UTC): (начало ретроградности, возврат к прямому движению)
+RETROGRADE_PERIODS = [
+    (date(2023, 12, 13), date(2024, 1, 2)),
+    (date(2024, 4, 1), date(2024, 4, 25)),
+    (date(2024, 8, 5), date(2024, 8, 28)),
+    (date(2024, 11, 26), date(2024, 12, 15)),
+    (date(2025, 3, 15), date(2025, 4, 7)),
+    (date(2025, 7, 18), date(2025, 8, 11)),
+    (date(2025, 11, 9), date(2025, 11, 29)),
+]
+
+
+def test_stations_2023_2025():
+    stations = []
+    day = date(2023, 12, 1)
+    while True:
+        station = next_station(day)
+        if station[0] > date(2025, 12, 31):
+            break
+        stations.append(station)
+        day = station[0]
+    expected = []
+    for start, end in RETROGRADE_PERIODS:
+        expected += [(start, STATION_RETROGRADE), (end, STATION_DIRECT)]
+    assert stations == expected
+
+
+@pytest.mark.parametrize("start, end", RETROGRADE_PERIODS)
+def test_is_retrograde_includes_both_stations(start, end):
+    assert not is_retrograde(start - timedelta(days=1))
+    assert is_retrograde(start)
+    assert is_retrograde(start + (end - start) / 2)
+    assert is_retrograde(end)
+    assert not is_retrograde(end + timedelta(days=1))
+
+
+def test_out_of_range():
+    with pytest.raises(ValueError):
+        is_retrograde(date(2101, 1, 1))
@@ -0,0 +1,32 @@
+# tests/test_moon_phases.py
+
+from datetime import date
+
+import pytest
+
+from moon_phases import get_phase_name
+
+# Новолуния и полнолуния 2024 года (UTC)
+NEW_MOONS_2024 = [
+    (1, 11), (2, 9), (3, 10), (4, 8), (5, 8), (6, 6), (7, 5),
+    (8, 4), (9, 3), (10, 2), (11, 1), (12, 1), (12, 30),
+]
+FULL_MOONS_2024 = [
+    (1, 25), (2, 24), (3, 25), (4, 23), (5, 23), (6, 22),
+    (7, 21), (8, 19), (9, 18), (10, 17), (11, 15), (12, 15),
+]
+
+
+@pytest.mark.parametrize("month, day", NEW_MOONS_2024)
+def test_new_moons_2024(month, day):
+    assert get_phase_name(date(2024, month, day)) == "Новолуние"
+
+
+@pytest.mark.parametrize("month, day", FULL_MOONS_2024)
+def test_full_moons_2024(month, day):
+    assert get_phase_name(date(2024, month, day)) == "Полнолуние"
+
+
+def test_out_of_range():
+    with pytest.raises(ValueError):
+        get_phase_name(date(1899, 12, 31))
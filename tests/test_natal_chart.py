@@ -0,0 +1,83 @@
+# tests/test_natal_chart.py
+
+import pytest
+
+from ephemeris import J2000, apparent_longitude, moon_longitude, sun_longitude
+from natal_chart import CITY_COORDINATES, compute_natal_chart, resolve_place
+
+# Допуск сравнения с опубликованными эфемеридами, градусы
+TOLERANCE = 0.5
+
+
+def assert_longitude(actual, expected):
+    assert abs((actual - expected + 180) % 360 - 180) < TOLERANCE
+
+
+@pytest.mark.parametrize(
+    "planet, expected",
+    [
+        ("mercury", 271.91),
+        ("venus", 241.58),
+        ("mars", 327.98),
+        ("jupiter", 25.35),
+        ("saturn", 40.24),
+        ("uranus", 314.8),
+        ("neptune", 303.19),
+        ("pluto", 251.45),
+    ],
+)
+def test_planets_at_j2000(planet, expected):
+    assert_longitude(apparent_longitude(planet, J2000), expected)
+
+
+def test_sun_and_moon_at_j2000():
+    assert_longitude(sun_longitude(J2000), 280.37)
+    assert_longitude(moon_longitude(J2000), 223.32)
+
+
+# 31.07.1990 14:30 по Москве (летнее время, UTC+4)
+@pytest.mark.parametrize(
+    "planet, expected",
+    [
+        ("sun", 127.95),  # Лев 7°57'
+        ("venus", 103.62),  # Рак 13°37'
+        ("mars", 42.29),  # Телец 12°17'
+        ("jupiter", 116.13),  # Рак 26°08'
+        ("saturn", 290.73),  # Козерог 20°44'
+        ("uranus", 276.38),  # Козерог 6°23'
+        ("neptune", 282.5),  # Козерог 12°30'
+        ("pluto", 224.97),  # Скорпион 14°58'
+    ],
+)
+def test_planets_1990_07_31(planet, expected):
+    chart = compute_natal_chart(31, 7, 1990, (14, 30), *CITY_COORDINATES["москва"])
+    assert_longitude(chart["planets"][planet], expected)
+
+
+def test_birth_time_uses_historical_utc_offset():
+    latitude, longitude, _ = CITY_COORDINATES["москва"]
+    # Летом 1990 года в Москве UTC+4, зимой - UTC+3 (Etc/GMT-N означает UTC+N)
+    summer = compute_natal_chart(31, 7, 1990, (14, 30), latitude, longitude, "Europe/Moscow")
+    assert summer == compute_natal_chart(31, 7, 1990, (14, 30), latitude, longitude, "Etc/GMT-4")
+    winter = compute_natal_chart(31, 1, 1990, (14, 30), latitude, longitude, "Europe/Moscow")
+    assert winter == compute_natal_chart(31, 1, 1990, (14, 30), latitude, longitude, "Etc/GMT-3")
+
+
+def test_chart_without_birth_time_has_no_houses():
+    chart = compute_natal_chart(31, 7, 1990)
+    assert chart["ascendant"] is None
+    assert chart["houses"] is None
+
+
+def test_houses_start_at_ascendant():
+    chart = compute_natal_chart(31, 7, 1990, (14, 30), *CITY_COORDINATES["москва"])
+    assert len(chart["houses"]) == 12
+    assert chart["houses"][0] == pytest.approx(chart["ascendant"])
+    assert chart["houses"][9] == pytest.approx(chart["midheaven"])
+
+
+def test_resolve_place():
+    assert resolve_place("г. Москва")[0] == "москва"
+    place, *_, found = resolve_place("Атлантида")
+    assert place == "краснодар"
+    assert not found
@@ -0,0 +1,61 @@
+# tests/test_parse_pool.py
+
+import asyncio
+import time
+
+import pytest
+
+import horoscope_api
+import rambler_parser
+
+
+class FakeContent:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def iter_chunked(self, size):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class FakeResponse:
+    charset = "utf-8"
+
+    def __init__(self, html, chunk_count):
+        data = html.encode("utf-8")
+        step = -(-len(data) // chunk_count)
+        self.content = FakeContent([data[i : i + step] for i in range(0, len(data), step)])
+
+
+PAGE = "<div class='article__text'><p>Гороскоп на сегодня.</p></div>" + "<div><p>x</p></div>" * 50
+
+
+@pytest.fixture(autouse=True)
+def thread_pool(monkeypatch):
+    monkeypatch.setattr(horoscope_api, "PARSE_POOL_KIND", "thread")
+    yield
+    horoscope_api.shutdown_parse_pool()
+
+
+def test_streaming_extraction_stops_at_article():
+    article, fallback, html = asyncio.run(
+        horoscope_api._extract_rambler_paragraphs(FakeResponse(PAGE, 10))
+    )
+    assert article == ["Гороскоп на сегодня."]
+    assert len(html) < len(PAGE)
+
+
+def test_parse_timeout_covers_whole_page(monkeypatch):
+    original_feed = rambler_parser.ArticleTextParser.feed
+
+    def slow_feed(self, data):
+        time.sleep(0.05)
+        return original_feed(self, data)
+
+    monkeypatch.setattr(rambler_parser.ArticleTextParser, "feed", slow_feed)
+    monkeypatch.setattr(horoscope_api, "PARSE_TIMEOUT", 0.12)
+    # Каждый кусок укладывается в лимит, а страница целиком - нет
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(
+            horoscope_api._extract_rambler_paragraphs(FakeResponse("<div><p>x</p></div>" * 20, 8))
+        )
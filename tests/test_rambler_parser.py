@@ -0,0 +1,49 @@
+# tests/test_rambler_parser.py
+
+from rambler_parser import ArticleTextParser, extract_article_paragraphs
+
+
+def test_article_container():
+    html = (
+        "<div class='header'><p>Меню сайта</p></div>"
+        "<div class='article__text'><p>Первый абзац.</p><div><p>Второй абзац.</p></div></div>"
+    )
+    article, fallback = extract_article_paragraphs(html)
+    assert article == ["Первый абзац.", "Второй абзац."]
+    assert fallback == ["Меню сайта"]
+
+
+def test_fallback_container():
+    html = (
+        "<div><script>var x = '<p>код</p>';</script><p>Реклама</p></div>"
+        "<div><p>Текст гороскопа.</p></div>"
+    )
+    article, fallback = extract_article_paragraphs(html)
+    assert article is None
+    assert fallback == ["Текст гороскопа."]
+
+
+def test_entities_are_decoded():
+    html = "<div class='article__text'><p>Любовь &amp; карьера&nbsp;&mdash; &#171;удача&#187;</p></div>"
+    article, _ = extract_article_paragraphs(html)
+    assert article == ["Любовь & карьера — «удача»"]
+
+
+def test_done_after_article_container():
+    parser = ArticleTextParser()
+    parser.feed("<div class='article__text'><p>Гороскоп на сегодня.</p>")
+    assert not parser.done
+    parser.feed("</div><div><p>Другие гороскопы</p></div>")
+    assert parser.done
+    assert parser.paragraphs == ["Гороскоп на сегодня."]
+    assert parser.fallback_paragraphs is None
+
+
+def test_paragraph_closed_after_its_div():
+    assert extract_article_paragraphs("<div><p>text here</div></p>") == (None, ["text here"])
+
+
+def test_stray_closing_tags():
+    article, fallback = extract_article_paragraphs("</p></div><p>вне div</p><div><p>a</p></p></div>")
+    assert article is None
+    assert fallback == ["a"]
@@ -0,0 +1,55 @@
+# tests/test_scheduler.py
+
+import asyncio
+
+import pytest
+
+import scheduler
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Заглушка get_daily_horoscope: задержка и источник задаются по знаку"""
+    state = {"delay": {}, "default": set(), "calls": []}
+
+    async def get_daily_horoscope(sign, force_refresh=False):
+        state["calls"].append((sign, asyncio.get_running_loop().time()))
+        await asyncio.sleep(state["delay"].get(sign, 0))
+        source = "default" if sign in state["default"] else "rambler"
+        return {"forecast": {"source": source}}
+
+    monkeypatch.setattr(scheduler, "get_daily_horoscope", get_daily_horoscope)
+    monkeypatch.setattr(scheduler, "ZODIAC_API_MAP", {"Овен": "aries", "Телец": "taurus", "Рак": "cancer"})
+    monkeypatch.setattr(scheduler, "PREWARM_CONCURRENCY", 1)
+    monkeypatch.setattr(scheduler, "PREWARM_RETRIES", 2)
+    monkeypatch.setattr(scheduler, "PREWARM_RETRY_DELAY", 0.2)
+    return state
+
+
+def test_retry_delay_does_not_block_other_signs(fetches):
+    fetches["default"].add("Овен")
+
+    async def main():
+        started = asyncio.get_running_loop().time()
+        failed = await scheduler.prewarm_horoscopes()
+        return failed, {sign: at - started for sign, at in fetches["calls"]}
+
+    failed, first_call = asyncio.run(main())
+    assert failed == ["Овен"]
+    # Пока "Овен" ждёт повтора, остальные знаки загружаются сразу
+    assert first_call["Телец"] < 0.1
+    assert first_call["Рак"] < 0.1
+
+
+def test_prewarm_stops_at_timeout(fetches):
+    fetches["delay"]["Рак"] = 5
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        failed = await scheduler.prewarm_horoscopes(timeout=0.2)
+        return failed, loop.time() - started
+
+    failed, elapsed = asyncio.run(main())
+    assert failed == ["Рак"]
+    assert elapsed < 0.5
@@ -0,0 +1,88 @@
+# tests/test_singleflight.py
+
+import asyncio
+
+import pytest
+
+import horoscope_api
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    """Заглушка загрузки гороскопа; кэши пусты"""
+    calls = []
+
+    async def fetch(sign, birth_day, birth_month, persistent_date, force_refresh=False):
+        calls.append((sign, force_refresh))
+        await asyncio.sleep(0.05)
+        if sign == "Ошибка":
+            raise RuntimeError("источник недоступен")
+        return {"sign": sign, "forced": force_refresh}
+
+    async def no_persistent_cache(sign, date):
+        return None
+
+    monkeypatch.setattr(horoscope_api, "_fetch_daily_horoscope", fetch)
+    monkeypatch.setattr(horoscope_api, "get_cached_horoscope", no_persistent_cache)
+    monkeypatch.setattr(horoscope_api, "horoscope_cache", horoscope_api.HoroscopeCache())
+    monkeypatch.setattr(horoscope_api, "_inflight_horoscopes", {})
+    monkeypatch.setattr(
+        horoscope_api, "horoscope_singleflight_stats", {"fetches": 0, "coalesced": 0}
+    )
+    return calls
+
+
+def test_concurrent_requests_share_one_fetch(fetches):
+    async def main():
+        return await asyncio.gather(
+            *(horoscope_api.get_daily_horoscope("Овен") for _ in range(10)),
+            horoscope_api.get_daily_horoscope("Телец"),
+        )
+
+    results = asyncio.run(main())
+    assert sorted(fetches) == [("Овен", False), ("Телец", False)]
+    assert all(result is results[0] for result in results[:10])
+    assert horoscope_api.horoscope_singleflight_stats == {"fetches": 2, "coalesced": 9}
+    assert not horoscope_api._inflight_horoscopes
+
+
+def test_forced_refresh_does_not_join_normal_fetch(fetches):
+    async def main():
+        return await asyncio.gather(
+            horoscope_api.get_daily_horoscope("Овен"),
+            horoscope_api.get_daily_horoscope("Овен", force_refresh=True),
+            horoscope_api.get_daily_horoscope("Овен", force_refresh=True),
+        )
+
+    normal, forced, forced_again = asyncio.run(main())
+    assert not normal["forced"]
+    assert forced["forced"] and forced_again is forced
+    assert sorted(fetches) == [("Овен", False), ("Овен", True)]
+
+
+def test_cancelled_waiter_does_not_cancel_fetch(fetches):
+    async def main():
+        first = asyncio.ensure_future(horoscope_api.get_daily_horoscope("Овен"))
+        second = asyncio.ensure_future(horoscope_api.get_daily_horoscope("Овен"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main())["sign"] == "Овен"
+    assert fetches == [("Овен", False)]
+
+
+def test_failure_reaches_every_waiter_and_is_not_kept(fetches):
+    async def main():
+        results = await asyncio.gather(
+            horoscope_api.get_daily_horoscope("Ошибка"),
+            horoscope_api.get_daily_horoscope("Ошибка"),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        # Следующий вызов запускает новую загрузку
+        with pytest.raises(RuntimeError):
+            await horoscope_api.get_daily_horoscope("Ошибка")
+
+    asyncio.run(main())
+    assert len(fetches) == 2
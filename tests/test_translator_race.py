@@ -0,0 +1,93 @@
+# tests/test_translator_race.py
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+import horoscope_api
+
+GOOD = "Сегодня удачный день для новых начинаний и встреч."
+
+
+def translator(name, delay, result=GOOD, log=None):
+    """Заглушка переводчика: отвечает через delay секунд"""
+
+    async def translate(text):
+        if log is not None:
+            log.append((name, asyncio.get_running_loop().time()))
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append((name, "cancelled"))
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    translate.__name__ = name
+    return translate
+
+
+@pytest.fixture(autouse=True)
+def race_settings(monkeypatch):
+    monkeypatch.setattr(horoscope_api, "TRANSLATION_RACE_STAGGER", 0.1)
+    monkeypatch.setattr(horoscope_api, "TRANSLATION_DEADLINE", 0.5)
+    monkeypatch.setattr(horoscope_api, "_translator_wins", Counter())
+    yield
+    horoscope_api.shutdown_parse_pool()
+
+
+def run_race(methods):
+    async def main():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        winner = await horoscope_api._race_translators("Good day", methods)
+        return winner, loop.time() - started
+
+    return asyncio.run(main())
+
+
+def test_fast_first_translator_wins_alone():
+    log = []
+    winner, _ = run_race([translator("a", 0.01, log=log), translator("b", 0.01, log=log)])
+    assert winner[0].__name__ == "a"
+    assert winner[1] == GOOD
+    assert [name for name, _ in log] == ["a"]
+    assert horoscope_api.get_translator_stats() == {"a": 1}
+
+
+def test_slow_translator_is_hedged_and_cancelled():
+    log = []
+    winner, elapsed = run_race([translator("slow", 5, log=log), translator("fast", 0.01, log=log)])
+    assert winner[0].__name__ == "fast"
+    assert ("slow", "cancelled") in log
+    assert 0.1 <= elapsed < 0.3
+
+
+def test_failure_starts_next_translator_immediately():
+    log = []
+    winner, elapsed = run_race(
+        [translator("broken", 0.01, RuntimeError("503"), log), translator("ok", 0.01, log=log)]
+    )
+    assert winner[0].__name__ == "ok"
+    assert elapsed < 0.1
+
+
+def test_bad_translation_is_rejected():
+    winner, _ = run_race([translator("echo", 0.01, "Good day"), translator("ok", 0.01)])
+    assert winner[0].__name__ == "ok"
+
+
+def test_deadline_returns_none_and_cancels_all():
+    log = []
+    winner, elapsed = run_race([translator("a", 5, log=log), translator("b", 5, log=log)])
+    assert winner is None
+    assert elapsed < 0.7
+    assert ("a", "cancelled") in log and ("b", "cancelled") in log
+
+
+def test_winners_go_first_next_time(monkeypatch):
+    monkeypatch.setattr(horoscope_api, "_translator_wins", Counter({"translate_with_mymemory_api": 2}))
+    assert horoscope_api._ordered_translators()[0].__name__ == "translate_with_mymemory_api"
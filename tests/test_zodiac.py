@@ -0,0 +1,49 @@
+# tests/test_zodiac.py
+
+from datetime import date
+
+from zodiac import get_sun_ingresses, get_zodiac_sign, get_zodiac_sign_for_date
+
+# Вступление Солнца в знаки в 2024 году
+INGRESSES_2024 = (
+    (date(2024, 1, 21), "Водолей"),
+    (date(2024, 2, 19), "Рыбы"),
+    (date(2024, 3, 20), "Овен"),
+    (date(2024, 4, 20), "Телец"),
+    (date(2024, 5, 21), "Близнецы"),
+    (date(2024, 6, 21), "Рак"),
+    (date(2024, 7, 22), "Лев"),
+    (date(2024, 8, 23), "Дева"),
+    (date(2024, 9, 23), "Весы"),
+    (date(2024, 10, 23), "Скорпион"),
+    (date(2024, 11, 22), "Стрелец"),
+    (date(2024, 12, 21), "Козерог"),
+)
+
+
+def test_ingresses_2024():
+    assert get_sun_ingresses(2024) == INGRESSES_2024
+
+
+def test_sign_for_date_switches_on_ingress_day():
+    previous = "Козерог"
+    for day, sign in INGRESSES_2024:
+        before = date.fromordinal(day.toordinal() - 1)
+        assert get_zodiac_sign_for_date(before.day, before.month, 2024) == previous
+        assert get_zodiac_sign_for_date(day.day, day.month, 2024) == sign
+        previous = sign
+
+
+def test_sign_for_date_rejects_missing_dates():
+    assert get_zodiac_sign_for_date(29, 2, 2023) == "Неизвестно"
+    assert get_zodiac_sign_for_date(31, 6, 2024) == "Неизвестно"
+    assert get_zodiac_sign_for_date(29, 2, 2024) == "Рыбы"
+
+
+def test_fixed_signs():
+    assert get_zodiac_sign(21, 3) == "Овен"
+    assert get_zodiac_sign(19, 4) == "Овен"
+    assert get_zodiac_sign(31, 7) == "Лев"
+    assert get_zodiac_sign(31, 12) == "Козерог"
+    assert get_zodiac_sign(0, 1) == "Неизвестно"
+    assert get_zodiac_sign(1, 13) == "Неизвестно"
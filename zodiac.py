@@ -2,6 +2,67 @@
 
 # zodiac.py
 
+from datetime import date
+
+from ephemeris import sun_longitude
+
+# Знаки в порядке эклиптической долготы Солнца (по 30° начиная с 0° Овна)
+ZODIAC_SIGNS = (
+    "Овен",
+    "Телец",
+    "Близнецы",
+    "Рак",
+    "Лев",
+    "Дева",
+    "Весы",
+    "Скорпион",
+    "Стрелец",
+    "Козерог",
+    "Водолей",
+    "Рыбы",
+)
+
+# Правильные астрологические даты перехода (усреднённые по годам):
+# (месяц, первый день знака, индекс знака)
+_CUSPS = (
+    (1, 20, 10),  # Водолей
+    (2, 19, 11),  # Рыбы
+    (3, 21, 0),  # Овен
+    (4, 20, 1),  # Телец
+    (5, 21, 2),  # Близнецы
+    (6, 21, 3),  # Рак
+    (7, 23, 4),  # Лев
+    (8, 23, 5),  # Дева
+    (9, 23, 6),  # Весы
+    (10, 23, 7),  # Скорпион
+    (11, 22, 8),  # Стрелец
+    (12, 22, 9),  # Козерог
+)
+
+
+def _build_fixed_table() -> tuple:
+    """Знак для каждой пары (месяц, день): 12 месяцев по 31 дню"""
+    table = []
+    sign = 9  # 1 января - Козерог
+    for month in range(1, 13):
+        cusp_day, cusp_sign = next((d, s) for m, d, s in _CUSPS if m == month)
+        for day in range(1, 32):
+            if day == cusp_day:
+                sign = cusp_sign
+            table.append(sign)
+    return tuple(table)
+
+
+FIXED_SIGN_TABLE = _build_fixed_table()
+
+# Годы, для которых даты перехода вычисляются по положению Солнца
+INGRESS_FIRST_YEAR = 1900
+INGRESS_LAST_YEAR = 2100
+
+# Год -> bytes: индекс знака для каждого дня года (0 - 1 января)
+_year_sign_tables = {}
+
+
 def get_zodiac_sign(day: int, month: int) -> str:
     """
     Определяет знак зодиака по дню и месяцу рождения.
@@ -16,36 +77,90 @@ def get_zodiac_sign(day: int, month: int) -> str:
     # Проверка корректности входных данных
     if not (1 <= month <= 12) or not (1 <= day <= 31):
         return "Неизвестно"
-        
-    # Правильные астрологические даты перехода
-    if (month == 12 and day >= 22) or (month == 1 and day <= 19):
-        return "Козерог"
-    elif (month == 1 and day >= 20) or (month == 2 and day <= 18):
-        return "Водолей"
-    elif (month == 2 and day >= 19) or (month == 3 and day <= 20):
-        return "Рыбы"
-    elif (month == 3 and day >= 21) or (month == 4 and day <= 19):
-        return "Овен"
-    elif (month == 4 and day >= 20) or (month == 5 and day <= 20):
-        return "Телец"
-    elif (month == 5 and day >= 21) or (month == 6 and day <= 20):
-        return "Близнецы"
-    elif (month == 6 and day >= 21) or (month == 7 and day <= 22):
-        return "Рак"
-    elif (month == 7 and day >= 23) or (month == 8 and day <= 22):
-        return "Лев"
-    elif (month == 8 and day >= 23) or (month == 9 and day <= 22):
-        return "Дева"
-    elif (month == 9 and day >= 23) or (month == 10 and day <= 22):
-        return "Весы"
-    elif (month == 10 and day >= 23) or (month == 11 and day <= 21):
-        return "Скорпион"
-    elif (month == 11 and day >= 22) or (month == 12 and day <= 21):
-        return "Стрелец"
-    else:
-        # Этот случай теоретически не должен произойти при корректных входных данных,
-        # но добавлен для полноты
+    return ZODIAC_SIGNS[FIXED_SIGN_TABLE[(month - 1) * 31 + day - 1]]
+
+
+def get_sun_ingresses(year: int) -> tuple:
+    """
+    Даты вступления Солнца в знаки за год: первый день, в полдень (UTC)
+    которого Солнце уже в новом знаке.
+    Returns:
+        tuple: ((date, знак), ...) в хронологическом порядке
+    """
+    return tuple(
+        (date.fromordinal(date(year, 1, 1).toordinal() + day_of_year), ZODIAC_SIGNS[sign])
+        for day_of_year, sign in _ingress_days(get_year_sign_table(year))
+    )
+
+
+def _ingress_days(table: bytes) -> list:
+    return [
+        (day_of_year, table[day_of_year])
+        for day_of_year in range(1, len(table))
+        if table[day_of_year] != table[day_of_year - 1]
+    ]
+
+
+def get_year_sign_table(year: int) -> bytes:
+    """Знак Солнца на каждый день года; вычисляется один раз на год"""
+    table = _year_sign_tables.get(year)
+    if table is None:
+        first = date(year, 1, 1).toordinal()
+        days = date(year + 1, 1, 1).toordinal() - first
+        # Юлианская дата полудня UTC 1 января
+        noon_jd = first + 1721425.0
+        table = bytes(
+            int(sun_longitude(noon_jd + day_of_year) // 30) % 12
+            for day_of_year in range(days)
+        )
+        _year_sign_tables[year] = table
+    return table
+
+
+def get_zodiac_sign_for_date(day: int, month: int, year: int) -> str:
+    """
+    Определяет знак зодиака с учётом года: даты перехода Солнца между знаками
+    смещаются от года к году на сутки, что важно для рождённых на границе знаков.
+    Вне диапазона INGRESS_FIRST_YEAR-INGRESS_LAST_YEAR используются
+    усреднённые даты, как в get_zodiac_sign.
+
+    Args:
+        day (int): День рождения.
+        month (int): Месяц рождения.
+        year (int): Год рождения.
+
+    Returns:
+        str: Название знака зодиака или "Неизвестно" для несуществующей даты.
+    """
+    if not INGRESS_FIRST_YEAR <= year <= INGRESS_LAST_YEAR:
+        return get_zodiac_sign(day, month)
+    try:
+        day_of_year = date(year, month, day).timetuple().tm_yday - 1
+    except ValueError:
         return "Неизвестно"
+    return ZODIAC_SIGNS[get_year_sign_table(year)[day_of_year]]
+
+def calculate_life_number(day: int, month: int, year: int) -> int:
+    """
+    Вычисляет Число жизни по числовым компонентам даты рождения.
+
+    Args:
+        day (int): День рождения.
+        month (int): Месяц рождения.
+        year (int): Год рождения.
+
+    Returns:
+        int: Однозначное число или мастер-число (11, 22, 33).
+    """
+    # Суммируем компоненты даты
+    total = day + month + year
+    # Приводим к однозначному числу
+    while total > 9:
+        # Проверка на мастер-числа
+        if total in [11, 22, 33]:
+            break
+        total = sum(int(digit) for digit in str(total))
+    return total
 
 # Словарь для API запросов
 ZODIAC_API_MAP = {